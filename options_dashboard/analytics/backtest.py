@@ -0,0 +1,209 @@
+import numpy as np
+import pandas as pd
+
+from options_dashboard.core import instrumentation as instr
+from options_dashboard.core.types import OptionType
+from options_dashboard.pricing import kernels
+
+_PATHS_MAX_BYTES = 256 * 2**20      # memo of priced value grids, per Backtester
+
+
+class Leg:
+    """
+    One option leg of a strategy, defined relative to the entry day:
+    strike = entry spot * moneyness, expiry = entry date + dte calendar days.
+    quantity is signed (negative = short).
+    """
+
+    def __init__(self, option_type: OptionType, moneyness=1.0, dte=30, quantity=1.0):
+        self.option_type = option_type
+        self.moneyness = float(moneyness)
+        self.dte = int(dte)
+        self.quantity = float(quantity)
+
+    def __repr__(self):
+        return f"Leg({self.option_type.value}, moneyness={self.moneyness}, dte={self.dte}, quantity={self.quantity})"
+
+
+class Backtester:
+    """
+    Backtests option strategies over a daily close history, entering on many
+    dates at once.
+
+    Legs are priced with Black-Scholes off either a stored IV series (e.g.
+    IVStore.series(ticker, "atm_iv_30d")) or, without one, a rolling realized
+    vol proxy. Every entry date x holding day x leg is priced in one kernel
+    call; exits (take-profit, stop-loss, time) are found with array
+    reductions rather than a per-day loop.
+    """
+
+    def __init__(self, history, iv=None, vol_window=20, rate=0.0, div_yield=0.0):
+        closes = pd.Series(history).dropna().astype(float)
+        closes.index = pd.to_datetime(closes.index).tz_localize(None).normalize()
+        self.closes = closes
+
+        if iv is not None:
+            iv = pd.Series(iv).astype(float)
+            iv.index = pd.to_datetime(iv.index).tz_localize(None).normalize()
+            vol = iv.reindex(closes.index).ffill()
+        else:
+            vol = np.log(closes).diff().rolling(vol_window).std() * np.sqrt(252)
+        self.vol = vol
+        self.rate = rate
+        self.div_yield = div_yield
+
+        self._spot = closes.to_numpy()
+        self._vol = vol.to_numpy(dtype=float)
+        self._days = ((closes.index - closes.index[0]).days).to_numpy()
+        self._paths = {}
+        self._paths_bytes = 0
+
+    def __getstate__(self):
+        # sweep() ships the backtester to every worker; each builds its own memo
+        state = self.__dict__.copy()
+        state["_paths"], state["_paths_bytes"] = {}, 0
+        return state
+
+    def run(self, legs, hold_days=None, take_profit=None, stop_loss=None, entry_every=1, start=None, end=None):
+        """
+        Enter `legs` every `entry_every` trading days between start and end.
+
+        hold_days: calendar days to hold (defaults to the shortest leg's dte).
+        take_profit / stop_loss: exit once P&L reaches +tp or -sl times the
+        absolute entry value.
+
+        Returns one row per trade: entry, exit, entry_value, exit_value, pnl,
+        days_held, exit_reason.
+        """
+        legs = list(legs)
+        hold_days = hold_days if hold_days is not None else min(leg.dte for leg in legs)
+        paths = self._value_paths(legs, hold_days, entry_every, start, end)
+        if paths is None:
+            return _empty_trades()
+        entries, idx, elapsed, in_window, value = paths
+        width = idx.shape[1]
+        pnl = value - value[:, :1]
+
+        # --- exits ---
+        scale = np.abs(value[:, :1])
+        hit_tp = (pnl >= take_profit * scale) if take_profit is not None else np.zeros_like(pnl, dtype=bool)
+        hit_sl = (pnl <= -stop_loss * scale) if stop_loss is not None else np.zeros_like(pnl, dtype=bool)
+        hit_tp &= in_window
+        hit_sl &= in_window
+        hit_tp[:, 0] = hit_sl[:, 0] = False
+
+        last = in_window.sum(axis=1) - 1
+        first_tp = np.where(hit_tp.any(axis=1), hit_tp.argmax(axis=1), width)
+        first_sl = np.where(hit_sl.any(axis=1), hit_sl.argmax(axis=1), width)
+        exit_col = np.minimum(np.minimum(first_tp, first_sl), last)
+        reason = np.where(exit_col == first_sl, "stop_loss", np.where(exit_col == first_tp, "take_profit", "time"))
+
+        rows = np.arange(entries.size)
+        exit_idx = idx[rows, exit_col]
+        return pd.DataFrame({
+            "entry": self.closes.index[entries],
+            "exit": self.closes.index[exit_idx],
+            "entry_spot": self._spot[entries],
+            "exit_spot": self._spot[exit_idx],
+            "entry_value": value[:, 0],
+            "exit_value": value[rows, exit_col],
+            "pnl": pnl[rows, exit_col],
+            "days_held": elapsed[rows, exit_col],
+            "exit_reason": reason,
+        })
+
+    def _value_paths(self, legs, hold_days, entry_every, start, end):
+        # strategy value for every entry x holding day; independent of the exit
+        # rules, so sweeps over take-profit/stop-loss reuse one pricing pass
+        key = (tuple((leg.option_type, leg.moneyness, leg.dte, leg.quantity) for leg in legs),
+               hold_days, entry_every, start, end)
+        if key in self._paths:
+            instr.count("backtest.path_cache_hits")
+            return self._paths[key]
+
+        n = len(self._spot)
+
+        # --- entry dates ---
+        valid = np.isfinite(self._vol)
+        if start is not None:
+            valid &= self.closes.index >= pd.Timestamp(start)
+        if end is not None:
+            valid &= self.closes.index <= pd.Timestamp(end)
+        entries = np.nonzero(valid)[0][::entry_every]
+        # only entries whose full holding window is inside the history
+        entries = entries[self._days[entries] + hold_days <= self._days[-1]]
+        if entries.size == 0:
+            return None
+
+        # --- entries x holding days grid (trading-day offsets) ---
+        width = int((np.searchsorted(self._days, self._days[entries] + hold_days, "right") - entries).max())
+        offsets = entries[:, None] + np.arange(width)[None, :]
+        idx = np.minimum(offsets, n - 1)
+        elapsed = self._days[idx] - self._days[entries][:, None]
+        in_window = (elapsed <= hold_days) & (offsets < n)
+
+        S0 = self._spot[entries][:, None, None]
+        S = self._spot[idx][:, :, None]
+        vol = self._vol[idx][:, :, None]
+        vol = np.where(np.isfinite(vol), vol, self._vol[entries][:, None, None])
+
+        moneyness = np.array([leg.moneyness for leg in legs])[None, None, :]
+        dte = np.array([leg.dte for leg in legs])[None, None, :]
+        qty = np.array([leg.quantity for leg in legs])
+        is_call = np.array([leg.option_type is OptionType.CALL for leg in legs])[None, None, :]
+        T = np.maximum(dte - elapsed[:, :, None], 0) / 365.0
+
+        with instr.timer("backtest.price"):
+            prices = kernels.bs_price(S, S0 * moneyness, T, self.rate, self.div_yield, vol, is_call)
+        value = prices @ qty                                   # entries x days
+
+        paths = (entries, idx, elapsed, in_window, value)
+        self._paths[key] = paths
+        self._paths_bytes += sum(a.nbytes for a in paths)
+        while self._paths_bytes > _PATHS_MAX_BYTES and len(self._paths) > 1:
+            self._paths_bytes -= sum(a.nbytes for a in self._paths.pop(next(iter(self._paths))))
+        return paths
+
+    def sweep(self, variants, n_jobs=1):
+        """
+        Run many rule variants (dicts of run() keyword arguments, each with
+        a "legs" entry) and return one summary row per variant. Variants are
+        spread across n_jobs processes (-1 for all cores).
+        """
+        with instr.timer("backtest.sweep"):
+            results = kernels.parallel_map(_summarize_variant, self, [(v,) for v in variants], n_jobs)
+        return pd.DataFrame(results)
+
+
+def summarize(trades):
+    """Trade-level stats for one run() result."""
+    pnl = trades["pnl"].to_numpy(dtype=float)
+    if pnl.size == 0:
+        return {"trades": 0, "win_rate": float("nan"), "mean_pnl": float("nan"), "total_pnl": 0.0,
+                "sharpe": float("nan"), "max_drawdown": 0.0}
+    equity = np.cumsum(pnl)
+    drawdown = np.maximum.accumulate(np.concatenate([[0.0], equity]))[1:] - equity
+    sd = pnl.std(ddof=1) if pnl.size > 1 else float("nan")
+    return {
+        "trades": int(pnl.size),
+        "win_rate": float((pnl > 0).mean()),
+        "mean_pnl": float(pnl.mean()),
+        "total_pnl": float(pnl.sum()),
+        "sharpe": float(pnl.mean() / sd) if sd and np.isfinite(sd) and sd > 0 else float("nan"),
+        "max_drawdown": float(drawdown.max()),
+    }
+
+
+def _summarize_variant(backtester, variant):
+    variant = dict(variant)
+    legs = variant.pop("legs")
+    stats = summarize(backtester.run(legs, **variant))
+    variant.update(stats)
+    variant["legs"] = legs
+    return variant
+
+
+def _empty_trades():
+    return pd.DataFrame(columns=["entry", "exit", "entry_spot", "exit_spot", "entry_value", "exit_value",
+                                 "pnl", "days_held", "exit_reason"])
+
@@ -0,0 +1,188 @@
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+from scipy.interpolate import UnivariateSpline
+
+from options_dashboard.analytics.ivpoints import build_iv_points
+from options_dashboard.core import instrumentation as instr
+from options_dashboard.core.types import OptionType
+from options_dashboard.pricing import kernels
+
+_CACHE = OrderedDict()
+_CACHE_SIZE = 32
+
+
+class ImpliedDistribution:
+    """
+    Risk-neutral terminal distribution per expiry (Breeden-Litzenberger).
+
+    For each expiry, total implied variance is smoothed with a cubic spline
+    in log-moneyness, turned back into call prices on a dense strike grid,
+    and differentiated twice: pdf(K) = exp(rT) d2C/dK2. The CDF is
+    integrated once at build time, so every probability query is a binary
+    search (np.interp) against stored arrays rather than a re-fit.
+    """
+
+    def __init__(self, market, grids):
+        self.market = market
+        # expiry -> dict(T, forward, strikes, pdf, cdf, mean, expected_move)
+        self._grids = grids
+
+    @classmethod
+    def from_iv_points(cls, points, market, n_grid=2001, n_sd=6.0, smoothing=None):
+        """
+        points: build_iv_points output (calls, puts or both).
+        smoothing: spline smoothing factor on total variance; None picks one
+        from the number of points.
+        """
+        grids = {}
+        with instr.timer("density.fit"):
+            for expiry, grp in points.groupby("expiry", sort=True):
+                T = float(grp["T"].iloc[0])
+                if T <= 0:
+                    continue
+                grid = _fit_expiry(grp, market, T, n_grid, n_sd, smoothing)
+                if grid is not None:
+                    grids[expiry] = grid
+        return cls(market, grids)
+
+    # --- lookups ---
+    @property
+    def expiries(self):
+        return sorted(self._grids)
+
+    def _grid(self, expiry):
+        try:
+            return self._grids[expiry]
+        except KeyError:
+            raise ValueError(f"No implied distribution for expiry {expiry}") from None
+
+    def pdf(self, expiry, level):
+        g = self._grid(expiry)
+        return np.interp(level, g["strikes"], g["pdf"], left=0.0, right=0.0)
+
+    def prob_below(self, expiry, level):
+        """P(S_T < level); level may be a scalar or an array."""
+        g = self._grid(expiry)
+        return np.interp(level, g["strikes"], g["cdf"], left=0.0, right=1.0)
+
+    def prob_above(self, expiry, level):
+        return 1.0 - self.prob_below(expiry, level)
+
+    def prob_between(self, expiry, lo, hi):
+        return self.prob_below(expiry, hi) - self.prob_below(expiry, lo)
+
+    def prob_touch(self, expiry, level):
+        """
+        Probability of touching `level` before expiry, via the reflection
+        principle: roughly twice the probability of finishing beyond it.
+        """
+        level = np.asarray(level, dtype=float)
+        spot = self.market.spot
+        beyond = np.where(level >= spot, self.prob_above(expiry, level), self.prob_below(expiry, level))
+        return np.minimum(2.0 * beyond, 1.0)
+
+    def quantile(self, expiry, p):
+        g = self._grid(expiry)
+        return np.interp(p, g["cdf"], g["strikes"])
+
+    def expected_move(self, expiry):
+        """E|S_T - F| plus the 16%/84% quantiles (a one-sd band)."""
+        g = self._grid(expiry)
+        lo, hi = self.quantile(expiry, [0.158655, 0.841345])
+        return {"forward": g["forward"], "mean": g["mean"], "expected_move": g["expected_move"],
+                "lower_1sd": float(lo), "upper_1sd": float(hi)}
+
+    def summary(self):
+        rows = [{"expiry": e, "T": self._grids[e]["T"], **self.expected_move(e)} for e in self.expiries]
+        return pd.DataFrame(rows)
+
+
+def implied_distribution(ticker, market, points=None, expiries=None, refresh=False, **kwargs):
+    """
+    ImpliedDistribution for a ticker, cached per market snapshot, market
+    value and fit options. Without points it builds OTM IV points (puts
+    below spot, calls above) for `expiries` (all listed by default);
+    explicit points are fitted directly and bypass the cache. refresh=True
+    re-downloads the chain and replaces any cached fit.
+    """
+    if points is not None:
+        return ImpliedDistribution.from_iv_points(points, market, **kwargs)
+
+    expiries = tuple(expiries) if expiries is not None else None
+    # the snapshot id refits fresh quotes; the value refits replace() scenario copies
+    key = (ticker.upper(), market.snapshot_id, market, expiries, tuple(sorted(kwargs.items())))
+    cached = None if refresh else _CACHE.get(key)
+    if cached is not None:
+        _CACHE.move_to_end(key)
+        instr.count("density.cache_hits")
+        return cached
+    instr.count("density.cache_misses")
+
+    calls = build_iv_points(ticker, market, option_type=OptionType.CALL, expiries=expiries, strike_min=market.spot,
+                            refresh=refresh)
+    puts = build_iv_points(ticker, market, option_type=OptionType.PUT, expiries=expiries, strike_max=market.spot)
+    points = pd.concat([puts, calls], ignore_index=True)
+
+    dist = ImpliedDistribution.from_iv_points(points, market, **kwargs)
+    _CACHE[key] = dist
+    if len(_CACHE) > _CACHE_SIZE:
+        _CACHE.popitem(last=False)
+    return dist
+
+
+def _fit_expiry(grp, market, T, n_grid, n_sd, smoothing):
+    F = market.forward(T)
+    smile = grp.groupby("strike")["iv"].mean()
+    if len(smile) < 3:
+        return None
+
+    x = np.log(smile.index.to_numpy(dtype=float) / F)
+    w = smile.to_numpy(dtype=float) ** 2 * T
+
+    # --- smooth total variance in log-moneyness ---
+    if len(x) >= 4:
+        s = smoothing if smoothing is not None else len(x) * (1e-4 * T) ** 2
+        fit = UnivariateSpline(x, w, k=3, s=s)
+    else:
+        fit = np.poly1d(np.polyfit(x, w, 2))
+
+    atm_vol = float(np.sqrt(max(fit(0.0), 1e-8) / T))
+    half = n_sd * atm_vol * np.sqrt(T)
+    x_grid = np.linspace(min(x[0], -half), max(x[-1], half), n_grid)
+    strikes = F * np.exp(x_grid)
+
+    # flat vol outside the quoted range so the wings don't run away
+    w_grid = fit(np.clip(x_grid, x[0], x[-1]))
+    w_grid = np.where(x_grid < x[0], fit(x[0]), w_grid)
+    w_grid = np.where(x_grid > x[-1], fit(x[-1]), w_grid)
+    sigma = np.sqrt(np.maximum(w_grid, 1e-10) / T)
+
+    r = market.rate_at(T)
+    calls = kernels.bs_price(market.spot, strikes, T, r, market.div_yield, sigma, True)
+
+    # --- Breeden-Litzenberger on the (non-uniform) strike grid ---
+    d1 = np.gradient(calls, strikes)
+    pdf = np.exp(r * T) * np.gradient(d1, strikes)
+    pdf = np.maximum(pdf, 0.0)          # butterfly arbitrage in the fit shows up as negative mass
+
+    area = _trapz(pdf, strikes)
+    if not np.isfinite(area) or area <= 0:
+        return None
+    pdf = pdf / area
+    cdf = np.concatenate([[0.0], np.cumsum(_segments(pdf, strikes))])
+    cdf = np.clip(cdf / cdf[-1], 0.0, 1.0)
+
+    mean = float(_trapz(strikes * pdf, strikes))
+    move = float(_trapz(np.abs(strikes - F) * pdf, strikes))
+    return {"T": T, "forward": F, "strikes": strikes, "pdf": pdf, "cdf": cdf,
+            "mean": mean, "expected_move": move}
+
+
+def _segments(y, x):
+    return 0.5 * (y[1:] + y[:-1]) * np.diff(x)
+
+
+def _trapz(y, x):
+    return float(_segments(y, x).sum())
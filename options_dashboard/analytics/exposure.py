@@ -0,0 +1,117 @@
+import numpy as np
+import pandas as pd
+
+from options_dashboard.core import instrumentation as instr
+from options_dashboard.core.types import OptionType
+from options_dashboard.pricing import kernels
+
+MEASURES = ("gex", "dex", "vanna")
+
+
+class Exposure:
+    """
+    Dealer gamma / delta / vanna exposure from chain open interest.
+
+    Every contract's IV is solved once from its mid (array kernel); Greeks
+    for the whole chain are then one vectorised pass and aggregation is a
+    grouped sum (np.bincount) over strike or expiry codes.
+
+    Dealer positioning follows the usual convention: dealers are long the
+    calls and short the puts customers trade (call_sign=+1, put_sign=-1).
+    Units, per 1-lot of `multiplier` shares:
+      gex   - dollar gamma per 1% spot move:      gamma * OI * mult * S^2 / 100
+      dex   - dollar delta:                        delta * OI * mult * S
+      vanna - dollar delta change per vol point:   vanna * OI * mult * S / 100
+    """
+
+    def __init__(self, chain, market, multiplier=100, call_sign=1.0, put_sign=-1.0, max_dte=None, min_oi=1):
+        self.market = market
+        self.multiplier = multiplier
+
+        with instr.timer("exposure.prepare"):
+            df = chain[(chain["mid"] > 0) & (chain["openInterest"].fillna(0) >= min_oi)]
+            days = np.array([(e - market.asof).days for e in df["expiry"]], dtype=float)
+            keep = (days > 0) & (days <= max_dte) if max_dte is not None else days > 0
+            df = df[keep]
+
+            K = df["strike"].to_numpy(dtype=float)
+            T = days[keep] / 365.0
+            is_call = (df["option_type"] == OptionType.CALL.value).to_numpy()
+            r = np.broadcast_to(market.rate_at(T), T.shape)
+            iv = kernels.implied_vol(df["mid"].to_numpy(dtype=float), market.spot, K, T, r, market.div_yield, is_call)
+            ok = np.isfinite(iv) & (iv > 0)
+            instr.count("exposure.iv_failed", int((~ok).sum()))
+
+        self.expiries = df["expiry"].to_numpy()[ok]
+        self._K, self._T, self._r, self._iv, self._call = K[ok], T[ok], r[ok], iv[ok], is_call[ok]
+        oi = df["openInterest"].fillna(0).to_numpy(dtype=float)[ok]
+        # signed dealer contracts
+        self._w = oi * multiplier * np.where(self._call, call_sign, put_sign)
+
+        self._strikes, self._strike_code = np.unique(self._K, return_inverse=True)
+        self._expiry_values, self._expiry_code = np.unique(self.expiries, return_inverse=True)
+        self._per_contract = self._exposures(market.spot)
+
+    def _exposures(self, S):
+        g = kernels.bs_greeks(S, self._K, self._T, self._r, self.market.div_yield, self._iv, self._call)
+        return {
+            "gex": self._w * g["gamma"] * S * S / 100,
+            "dex": self._w * g["delta"] * S,
+            "vanna": self._w * g["vanna"] * S / 100,
+        }
+
+    # --- aggregation ---
+    def by_strike(self, measure="gex"):
+        return pd.Series(np.bincount(self._strike_code, self._values(measure), len(self._strikes)),
+                         index=pd.Index(self._strikes, name="strike"), name=measure)
+
+    def by_expiry(self, measure="gex"):
+        return pd.Series(np.bincount(self._expiry_code, self._values(measure), len(self._expiry_values)),
+                         index=pd.Index(self._expiry_values, name="expiry"), name=measure)
+
+    def grid(self, measure="gex"):
+        """expiry x strike table of one measure."""
+        n_k = len(self._strikes)
+        flat = np.bincount(self._expiry_code * n_k + self._strike_code, self._values(measure),
+                           len(self._expiry_values) * n_k)
+        return pd.DataFrame(flat.reshape(-1, n_k), index=pd.Index(self._expiry_values, name="expiry"),
+                            columns=pd.Index(self._strikes, name="strike"))
+
+    def totals(self):
+        return {m: float(self._per_contract[m].sum()) for m in MEASURES}
+
+    def _values(self, measure):
+        if measure not in MEASURES:
+            raise ValueError(f"measure must be one of {MEASURES}")
+        return self._per_contract[measure]
+
+    # --- spot profile ---
+    def profile(self, spots=None, width=0.15, n=101, chunk=500_000):
+        """
+        Total GEX with every contract repriced at each spot in `spots`
+        (default: n points within +-width of spot), holding IVs and T fixed.
+        Returns a Series indexed by spot.
+        """
+        S = np.asarray(spots, dtype=float) if spots is not None \
+            else self.market.spot * np.linspace(1 - width, 1 + width, n)
+        out = np.zeros(S.size)
+        step = max(1, chunk // max(S.size, 1))
+        with instr.timer("exposure.profile"):
+            for i in range(0, len(self._K), step):
+                sl = slice(i, i + step)
+                gamma = kernels.bs_gamma(S[:, None], self._K[sl], self._T[sl], self._r[sl], self.market.div_yield,
+                                         self._iv[sl])
+                out += (gamma * self._w[sl]).sum(axis=1) * S * S / 100
+        return pd.Series(out, index=pd.Index(S, name="spot"), name="gex")
+
+    def zero_gamma(self, profile=None):
+        """Spot level where the GEX profile changes sign (NaN if it doesn't)."""
+        profile = profile if profile is not None else self.profile()
+        S, g = profile.index.to_numpy(), profile.to_numpy()
+        flips = np.nonzero(np.sign(g[:-1]) != np.sign(g[1:]))[0]
+        if flips.size == 0:
+            return float("nan")
+        # the crossing nearest the current spot, linearly interpolated
+        i = flips[np.argmin(np.abs(S[flips] - self.market.spot))]
+        return float(S[i] - g[i] * (S[i + 1] - S[i]) / (g[i + 1] - g[i]))
+
@@ -0,0 +1,152 @@
+import math
+
+import numpy as np
+import pandas as pd
+
+from options_dashboard.core import instrumentation as instr
+from options_dashboard.core.types import OptionType
+from options_dashboard.pricing import kernels
+
+MODELS = ("gbm", "bootstrap")
+
+
+class DeltaHedgeSimulator:
+    """
+    Monte Carlo P&L of a delta-hedged option position held to expiry.
+
+    The option is bought (or sold) at its Black-Scholes value under the
+    implied vol and hedged with shares at that same vol every
+    `rebalance_every` steps, while the underlying follows either GBM at a
+    chosen realized vol or daily log returns bootstrapped from a close
+    history (rescaled to the step length when steps_per_year != 252).
+    Long option P&L is roughly positive when realized beats implied, so
+    the distribution answers "is IV rich versus RV?".
+
+    Paths are simulated in blocks of `block_size`; each step prices delta
+    for every path in the block with one kernels.bs_greeks call. Blocks
+    are independent (seeded from one SeedSequence), so results don't
+    depend on n_jobs, and with n_jobs > 1 they run in worker processes.
+    """
+
+    def __init__(self, n_paths=10_000, rebalance_every=1, steps_per_year=252, model="gbm", history=None,
+                 transaction_cost=0.0, block_size=2_000, n_jobs=1, seed=1234):
+        if model not in MODELS:
+            raise ValueError(f"model must be one of {MODELS}")
+        if model == "bootstrap" and history is None:
+            raise ValueError("bootstrap model needs a close history")
+        self.n_paths = int(n_paths)
+        self.rebalance_every = max(int(rebalance_every), 1)
+        self.steps_per_year = steps_per_year
+        self.model = model
+        self.history = history
+        self.transaction_cost = transaction_cost      # fraction of traded share notional
+        self.block_size = int(block_size)
+        self.n_jobs = n_jobs
+        self.seed = seed
+
+    def run(self, contract, market, quantity=1.0, implied_vol=None, realized_vol=None, drift=None):
+        """
+        Simulate the hedged position and return per-path P&L discounted to
+        market.asof.
+
+        quantity: signed number of options (negative = short, hedge is long delta).
+        implied_vol: vol used for the premium and hedge ratios (defaults to
+        market.sigma at the contract's strike and expiry).
+        realized_vol: GBM path vol (defaults to implied_vol); ignored for bootstrap.
+        drift: annual drift of the underlying (defaults to rate - div_yield).
+        """
+        T = contract.time_to_expiry(market)
+        if T <= 0:
+            raise ValueError("Contract has expired")
+        spec = self._spec(contract, market, T, quantity, implied_vol, realized_vol, drift)
+
+        blocks = []
+        remaining = self.n_paths
+        for child in np.random.SeedSequence(self.seed).spawn(math.ceil(self.n_paths / self.block_size)):
+            n = min(self.block_size, remaining)
+            blocks.append((child, n))
+            remaining -= n
+
+        with instr.timer("hedging.run"):
+            results = kernels.parallel_map(_simulate_block, spec, blocks, self.n_jobs)
+        instr.count("hedging.paths", self.n_paths)
+        return np.concatenate(results)
+
+    def _spec(self, contract, market, T, quantity, implied_vol, realized_vol, drift):
+        # plain-data description of one simulation, cheap to ship to workers
+        steps = max(int(round(T * self.steps_per_year)), 1)
+        dt = T / steps
+        sigma = float(implied_vol if implied_vol is not None else market.sigma(contract.strike, T))
+        r = float(market.rate_at(T))
+        mu = float(drift if drift is not None else r - market.div_yield)
+
+        returns = None
+        if self.model == "bootstrap":
+            log_ret = np.log(pd.Series(self.history).dropna().astype(float)).diff().dropna().to_numpy()
+            # keep the historical shape of daily moves, rescaled from one trading day to dt,
+            # but swap in the requested drift
+            ann_var = log_ret.var() * 252
+            returns = (log_ret - log_ret.mean()) * math.sqrt(dt * 252) + (mu - 0.5 * ann_var) * dt
+
+        return {
+            "S0": float(market.spot), "K": float(contract.strike), "T": T, "steps": steps, "dt": dt,
+            "r": r, "q": float(market.div_yield), "sigma": sigma,
+            "path_vol": float(realized_vol if realized_vol is not None else sigma), "mu": mu,
+            "is_call": contract.option_type is OptionType.CALL, "quantity": float(quantity),
+            "rebalance_every": self.rebalance_every, "cost": float(self.transaction_cost), "returns": returns,
+        }
+
+
+def summarize(pnl, level=0.95):
+    """Distribution stats for a run() result; var/cvar are losses at `level`."""
+    pnl = np.asarray(pnl, dtype=float)
+    tail = np.quantile(pnl, 1 - level)
+    q = np.quantile(pnl, [0.05, 0.25, 0.5, 0.75, 0.95])
+    return {
+        "paths": int(pnl.size),
+        "mean": float(pnl.mean()),
+        "std": float(pnl.std(ddof=1)) if pnl.size > 1 else float("nan"),
+        "stderr": float(pnl.std(ddof=1) / math.sqrt(pnl.size)) if pnl.size > 1 else float("nan"),
+        "p05": float(q[0]), "p25": float(q[1]), "median": float(q[2]), "p75": float(q[3]), "p95": float(q[4]),
+        "prob_profit": float((pnl > 0).mean()),
+        "var": float(-tail),
+        "cvar": float(-pnl[pnl <= tail].mean()),
+    }
+
+
+def _simulate_block(spec, seed, n):
+    rng = np.random.default_rng(seed)
+    steps, dt = spec["steps"], spec["dt"]
+    K, r, q, sigma, is_call = spec["K"], spec["r"], spec["q"], spec["sigma"], spec["is_call"]
+    qty, cost = spec["quantity"], spec["cost"]
+
+    # --- paths ---
+    if spec["returns"] is None:
+        vol = spec["path_vol"]
+        log_ret = (spec["mu"] - 0.5 * vol * vol) * dt + vol * math.sqrt(dt) * rng.standard_normal((n, steps))
+    else:
+        log_ret = spec["returns"][rng.integers(0, spec["returns"].size, (n, steps))]
+    S = np.empty((n, steps + 1))
+    S[:, 0] = spec["S0"]
+    S[:, 1:] = spec["S0"] * np.exp(np.cumsum(log_ret, axis=1))
+
+    # --- hedge ---
+    S0 = spec["S0"]
+    g = kernels.bs_greeks(S0, K, spec["T"], r, q, sigma, is_call)
+    shares = np.full(n, -qty * float(g["delta"]))
+    cash = np.full(n, -qty * float(g["price"]) - shares[0] * S0 - cost * abs(shares[0]) * S0)
+
+    grow, carry = math.exp(r * dt), math.exp(q * dt) - 1.0
+    for k in range(1, steps + 1):
+        cash = cash * grow + shares * S[:, k - 1] * carry
+        if k < steps and k % spec["rebalance_every"] == 0:
+            delta = kernels.bs_greeks(S[:, k], K, spec["T"] - k * dt, r, q, sigma, is_call)["delta"]
+            trade = -qty * delta - shares
+            cash -= trade * S[:, k] + cost * np.abs(trade) * S[:, k]
+            shares += trade
+
+    ST = S[:, -1]
+    payoff = np.maximum(ST - K, 0.0) if is_call else np.maximum(K - ST, 0.0)
+    pnl = qty * payoff + shares * ST - cost * np.abs(shares) * ST + cash
+    return pnl * math.exp(-r * spec["T"])
+
@@ -0,0 +1,190 @@
+import math
+import numpy as np
+import pandas as pd
+
+from options_dashboard.core import instrumentation as instr
+from options_dashboard.core.contract import Contract
+from options_dashboard.core.types import OptionType
+from options_dashboard.pricing import kernels
+from options_dashboard.pricing.blackscholes import BlackScholesPricer
+
+QUOTE_KEY = ["expiry", "strike", "option_type"]
+
+
+def quote_key(contract):
+    # same (expiry, strike, option_type) triple the chain is indexed by
+    return (contract.expiry, float(contract.strike), contract.option_type.value)
+
+
+class IncrementalRepricer:
+    """
+    Keeps implied vols and position valuations in sync with successive
+    option chain snapshots (as returned by get_option_chain).
+
+    Each update() diffs the new snapshot against the previous one, re-solves
+    IV only for quotes whose mid moved (or that are new) and reprices only
+    the positions sitting on those quotes. A spot move changes every IV and
+    every position, so it dirties everything; with the stock Black-Scholes
+    pricer the dirty quotes are solved in one implied_vol kernel call.
+    spot_tol defaults to half a one-cent tick, so sub-tick noise in the spot
+    doesn't trigger a full re-solve.
+
+    Subscribers are called as callback(event, payload):
+      "quotes"   -> {"added": [...], "changed": [...], "removed": [...]}
+      "iv"       -> {quote_key: iv} for every re-solved quote
+      "position" -> {"name", "quantity", "iv", "value", "delta", ...}
+    """
+
+    def __init__(self, market, pricer=None, mid_tol=1e-9, spot_tol=0.005):
+        self.market = market
+        self.pricer = pricer or BlackScholesPricer()
+        self.mid_tol = mid_tol
+        self.spot_tol = spot_tol
+
+        self._mids = None
+        self._ivs = {}
+        self._positions = {}
+        self._pending = set()
+        self._results = {}
+        self._listeners = []
+
+    # --- subscriptions ---
+    def subscribe(self, callback):
+        self._listeners.append(callback)
+        return callback
+
+    def unsubscribe(self, callback):
+        self._listeners.remove(callback)
+
+    def _emit(self, event, payload):
+        for callback in list(self._listeners):
+            callback(event, payload)
+
+    # --- positions ---
+    def add_position(self, name, contract, quantity=1.0):
+        self._positions[name] = (contract, float(quantity))
+        # priced on the next update even if its quote doesn't move
+        self._pending.add(name)
+
+    def remove_position(self, name):
+        self._positions.pop(name, None)
+        self._results.pop(name, None)
+        self._pending.discard(name)
+
+    def position(self, name):
+        return self._results.get(name)
+
+    def positions(self):
+        return pd.DataFrame(list(self._results.values()))
+
+    def iv(self, key):
+        return self._ivs.get(key, float("nan"))
+
+    # --- refresh ---
+    def update(self, chain, spot=None):
+        """
+        Apply a new chain snapshot (and optionally a new spot).
+        Returns a dict with the number of quotes re-solved and positions repriced.
+        """
+        spot_moved = False
+        if spot is not None and abs(float(spot) - self.market.spot) > self.spot_tol:
+            self.market = self.market.replace(new_snapshot=True, spot=float(spot))
+            spot_moved = True
+
+        mids = chain.assign(strike=chain["strike"].astype(float)).set_index(QUOTE_KEY)["mid"].astype(float)
+        mids = mids[~mids.index.duplicated(keep="last")]
+
+        # --- diff against the previous snapshot ---
+        prev = self._mids if self._mids is not None else mids.iloc[:0]
+        common = mids.index.intersection(prev.index)
+        moved = abs(mids.loc[common].to_numpy() - prev.loc[common].to_numpy()) > self.mid_tol
+        changed = common[moved]
+        added = mids.index.difference(prev.index)
+        removed = prev.index.difference(mids.index)
+        self._mids = mids
+
+        if len(added) or len(changed) or len(removed):
+            self._emit("quotes", {"added": list(added), "changed": list(changed), "removed": list(removed)})
+
+        # --- re-solve IVs ---
+        for key in removed:
+            self._ivs.pop(key, None)
+
+        dirty = list(mids.index) if spot_moved else list(added) + list(changed)
+        with instr.timer("incremental.iv_solve"):
+            if type(self.pricer) is BlackScholesPricer:
+                solved = self._solve_batch(dirty, mids)
+            else:
+                solved = {key: self._solve(key, float(mids[key])) for key in dirty}
+        self._ivs.update(solved)
+        instr.count("incremental.iv_cache_hits", len(mids) - len(solved))
+        instr.count("incremental.iv_cache_misses", len(solved))
+        if solved:
+            self._emit("iv", solved)
+
+        # --- reprice affected positions ---
+        touched = set(solved) | set(removed)
+        affected = [
+            name for name, (contract, _) in self._positions.items()
+            if spot_moved or name in self._pending or quote_key(contract) in touched
+        ]
+        for name in affected:
+            result = self._reprice(name)
+            if result is None:
+                continue
+            self._results[name] = result
+            self._emit("position", result)
+        self._pending.clear()
+
+        return {"spot_moved": spot_moved, "solved": len(solved), "repriced": len(affected)}
+
+    def _solve(self, key, mid):
+        expiry, strike, option_type = key
+        contract = _contract_for(expiry, strike, option_type)
+        if contract.time_to_expiry(self.market) <= 0:
+            return float("nan")
+        iv = self.pricer.implied_vol(contract, self.market, mid)
+        if iv is None or not math.isfinite(iv) or iv <= 0:
+            return float("nan")
+        return float(iv)
+
+    def _solve_batch(self, keys, mids):
+        # plain Black-Scholes: one array kernel call for every dirty quote
+        if not keys:
+            return {}
+        m = self.market
+        days = np.array([(expiry - m.asof).days for expiry, _, _ in keys], dtype=float)
+        T = np.maximum(days / 365.0, 0.0)
+        strike = np.array([strike for _, strike, _ in keys], dtype=float)
+        is_call = np.array([option_type == OptionType.CALL.value for _, _, option_type in keys])
+        mid = mids.loc[keys].to_numpy(dtype=float)
+        iv = kernels.implied_vol(mid, m.spot, strike, T, m.rate_at(T), m.div_yield, is_call)
+        iv = np.where((T > 0) & np.isfinite(iv) & (iv > 0), iv, np.nan)
+        return dict(zip(keys, iv.tolist()))
+
+    def _reprice(self, name):
+        contract, quantity = self._positions[name]
+        if contract.time_to_expiry(self.market) <= 0:
+            return None
+
+        # price off the position's own market IV when the chain has one
+        iv = self._ivs.get(quote_key(contract), float("nan"))
+        sigma = iv if math.isfinite(iv) else None
+
+        p = self.pricer
+        m = self.market
+        return {
+            "name": name,
+            "quantity": quantity,
+            "iv": iv,
+            "value": quantity * p.price(contract, m, sigma_overide=sigma),
+            "delta": quantity * p.delta(contract, m, sigma_overide=sigma),
+            "gamma": quantity * p.gamma(contract, m, sigma_overide=sigma),
+            "theta": quantity * p.theta(contract, m, sigma_overide=sigma),
+            "vega": quantity * p.vega(contract, m, sigma_overide=sigma) / 100,
+            "rho": quantity * p.rho(contract, m, sigma_overide=sigma),
+        }
+
+
+def _contract_for(expiry, strike, option_type):
+    return Contract(strike=strike, expiry=expiry, option_type=OptionType(option_type), exercise_style="European")
@@ -1,8 +1,11 @@
 import math
+import numpy as np
 import pandas as pd
 
+from options_dashboard.core import instrumentation as instr
 from options_dashboard.core.contract import Contract
-from options_dashboard.data.data import get_option_chain
+from options_dashboard.data.data import get_chain
+from options_dashboard.pricing import kernels
 from options_dashboard.pricing.blackscholes import BlackScholesPricer
 from options_dashboard.core.types import OptionType
 
@@ -17,68 +20,101 @@ def build_iv_points(
     min_mid: float = 0.01,
     max_spread_pct: float = 0.30,
     pricer=None,
+    refresh: bool = False,
 ):
     """
     Returns a DataFrame of IV points with columns:
     expiry, T, strike, option_type, mid, iv
+
+    Quotes come from the session chain handle (get_chain), so they can be
+    up to its max_age old; refresh=True re-downloads them first.
     """
     pricer = pricer or BlackScholesPricer()
 
-    chain = get_option_chain(ticker)
+    # expiry/strike/type filters are pushed into the chain handle, so only the
+    # requested expiries are downloaded (and each only once per session)
+    with instr.timer("ivpoints.fetch"):
+        chain = get_chain(ticker, refresh=refresh).frame(expiries, strike_min, strike_max, option_type)
 
     # --- filter ---
-    df = chain.copy()
-    df = df[df["option_type"] == option_type]
-
-    if expiries is not None:
-        df = df[df["expiry"].isin(expiries)]
-
-    if strike_min is not None:
-        df = df[df["strike"] >= float(strike_min)]
-    if strike_max is not None:
-        df = df[df["strike"] <= float(strike_max)]
+    with instr.timer("ivpoints.filter"):
+        # liquidity / sanity filters
+        df = chain[chain["mid"] >= float(min_mid)]
+        df = df[(df["ask"] > 0) & (df["bid"] > 0)]
 
-    # liquidity / sanity filters
-    df = df[df["mid"] >= float(min_mid)]
-    df = df[(df["ask"] > 0) & (df["bid"] > 0)]
+        # drop crazy-wide spreads
+        spread = (df["ask"] - df["bid"]).astype(float)
+        mid = df["mid"].astype(float)
+        df = df[(spread / mid) <= float(max_spread_pct)]
 
-    # drop crazy-wide spreads
-    spread = (df["ask"] - df["bid"]).astype(float)
-    mid = df["mid"].astype(float)
-    df = df[(spread / mid) <= float(max_spread_pct)]
+    instr.count("ivpoints.quotes_fetched", len(chain))
+    instr.count("ivpoints.quotes_kept", len(df))
 
     # --- compute IVs ---
-    rows = []
-    for r in df.itertuples(index=False):
-        expiry = r.expiry
-        strike = float(r.strike)
-        market_price = float(r.mid)
-
-        contract = Contract(
-            strike=strike,
-            expiry=expiry,
-            option_type=option_type,
-            exercise_style="European",
-        )
-
-        T = contract.time_to_expiry(market)
-        if T <= 0:
-            continue
-
-        iv = pricer.implied_vol(contract, market, market_price)
-
-        if iv is None or (isinstance(iv, float) and (math.isnan(iv) or iv <= 0)):
-            continue
-
-        rows.append(
-            {
-                "expiry": expiry,
-                "T": T,
-                "strike": strike,
-                "option_type": option_type,
-                "mid": market_price,
-                "iv": float(iv),
-            }
-        )
+    if type(pricer) is BlackScholesPricer:
+        # plain Black-Scholes: solve the whole chain at once with the array kernel
+        with instr.timer("ivpoints.iv_solve"):
+            return _solve_vectorized(df, market, option_type)
+
+    with instr.timer("ivpoints.iv_solve"):
+        rows = []
+        for r in df.itertuples(index=False):
+            expiry = r.expiry
+            strike = float(r.strike)
+            market_price = float(r.mid)
+
+            contract = Contract(
+                strike=strike,
+                expiry=expiry,
+                option_type=option_type,
+                exercise_style="European",
+            )
+
+            T = contract.time_to_expiry(market)
+            if T <= 0:
+                continue
+
+            iv = pricer.implied_vol(contract, market, market_price)
+
+            if iv is None or (isinstance(iv, float) and (math.isnan(iv) or iv <= 0)):
+                instr.count("ivpoints.iv_failed")
+                continue
+
+            rows.append(
+                {
+                    "expiry": expiry,
+                    "T": T,
+                    "strike": strike,
+                    "option_type": option_type,
+                    "mid": market_price,
+                    "iv": float(iv),
+                }
+            )
 
     return pd.DataFrame(rows).sort_values(["expiry", "strike"]).reset_index(drop=True)
+
+
+
+def _solve_vectorized(df, market, option_type):
+    expiry = df["expiry"].to_numpy()
+    days = np.array([(e - market.asof).days for e in expiry], dtype=float)
+    T = np.maximum(days / 365.0, 0.0)
+    strike = df["strike"].to_numpy(dtype=float)
+    mid = df["mid"].to_numpy(dtype=float)
+
+    iv = kernels.implied_vol(
+        mid, market.spot, strike, T, market.rate_at(T), market.div_yield,
+        option_type is OptionType.CALL,
+    )
+    keep = (T > 0) & np.isfinite(iv) & (iv > 0)
+    instr.count("ivpoints.iv_failed", int(((T > 0) & ~keep).sum()))
+
+    out = pd.DataFrame({
+        "expiry": expiry[keep],
+        "T": T[keep],
+        "strike": strike[keep],
+        "option_type": option_type,
+        "mid": mid[keep],
+        "iv": iv[keep],
+    })
+    return out.sort_values(["expiry", "strike"]).reset_index(drop=True)
@@ -0,0 +1,365 @@
+import numpy as np
+import pandas as pd
+from scipy.special import ndtri
+
+from options_dashboard.core import instrumentation as instr
+from options_dashboard.core.types import OptionType
+from options_dashboard.pricing import kernels
+
+KINDS = ("vertical", "iron_condor", "butterfly", "calendar")
+GREEKS = ("delta", "gamma", "vega", "theta")
+RANK_BY = ("ev", "pop", "ev_to_risk")
+
+
+class StrategySearch:
+    """
+    Enumerates and ranks multi-leg strategies on a filtered option chain.
+
+    Each quote gets an IV and Greeks once (array kernels). Candidates of one
+    kind are built as index arrays into those quotes (one column per leg),
+    pruned on width, short-leg delta and credit/debit before any scoring,
+    and scored in bulk:
+
+      - verticals, iron condors and butterflies are held to expiry; expected
+        value uses each quote's expected payoff under the terminal
+        distribution, and probability of profit integrates that
+        distribution between the breakevens of the piecewise-linear payoff
+      - calendars are closed at the near expiry, with the far leg repriced
+        at its own IV on every point of the near-expiry distribution
+
+    The terminal distribution per expiry is an equal-probability grid from
+    an ImpliedDistribution when one is given, otherwise lognormal at the
+    expiry's ATM IV. All P&L figures are per one-lot at expiry (the near
+    expiry for calendars), in option price units.
+    """
+
+    def __init__(self, chain, market, distribution=None, strike_window=0.25, max_dte=180, min_mid=0.05,
+                 max_spread_pct=0.30, n_grid=400):
+        self.market = market
+        with instr.timer("strategies.prepare"):
+            q = _prepare_quotes(chain, market, strike_window, max_dte, min_mid, max_spread_pct)
+        self.quotes = q
+        self.expiries = sorted(q["expiry"].unique())
+
+        self._K = q["strike"].to_numpy(dtype=float)
+        self._call = q["is_call"].to_numpy(dtype=bool)
+        self._bid = q["bid"].to_numpy(dtype=float)
+        self._ask = q["ask"].to_numpy(dtype=float)
+        self._mid = q["mid"].to_numpy(dtype=float)
+        self._iv = q["iv"].to_numpy(dtype=float)
+        self._exp = q["expiry"].map({e: i for i, e in enumerate(self.expiries)}).to_numpy(dtype=int)
+        self._T = np.array([(e - market.asof).days / 365.0 for e in self.expiries])
+        self._growth = np.array([1.0 / market.discount(T) for T in self._T])
+        self._greeks = {g: q[g].to_numpy(dtype=float) for g in GREEKS}
+
+        # --- terminal distribution per expiry (equal-probability grid) ---
+        self._p = (np.arange(n_grid) + 0.5) / n_grid
+        self._grid = np.vstack([self._terminal_grid(i, distribution) for i in range(len(self.expiries))]) \
+            if self.expiries else np.empty((0, n_grid))
+
+        # expected payoff of every quote at its own expiry
+        S = self._grid[self._exp]
+        K = self._K[:, None]
+        payoff = np.where(self._call[:, None], np.maximum(S - K, 0.0), np.maximum(K - S, 0.0))
+        self._exp_payoff = payoff.mean(axis=1)
+
+    def _terminal_grid(self, i, distribution):
+        expiry, T = self.expiries[i], self._T[i]
+        if distribution is not None and expiry in distribution.expiries:
+            return np.asarray(distribution.quantile(expiry, self._p), dtype=float)
+
+        m = self.market
+        F = m.forward(T)
+        on_expiry = self._exp == i
+        atm = np.argmin(np.abs(self._K[on_expiry] - F))
+        sigma = self._iv[on_expiry][atm]
+        return F * np.exp(-0.5 * sigma * sigma * T + sigma * np.sqrt(T) * ndtri(self._p))
+
+    # --- public ---
+    def search(self, kinds=KINDS, max_width=None, min_credit=0.0, max_debit=None, short_delta=(0.05, 0.50),
+               max_loss=None, min_pop=None, max_abs_delta=None, max_abs_vega=None, max_sides=150,
+               fill="mid", rank_by="ev", top=25):
+        """
+        Return the `top` candidates ranked by `rank_by` ("ev", "pop" or
+        "ev_to_risk"), one row per strategy.
+
+        max_width: widest strike distance between adjacent legs (default 10% of spot).
+        min_credit / max_debit: pruning on the net premium of credit / debit structures.
+        short_delta: (lo, hi) bounds on |delta| of every short leg.
+        max_loss, min_pop, max_abs_delta, max_abs_vega: filters on the scored set.
+        max_sides: credit spreads kept per side and expiry before pairing them into condors.
+        fill: "mid", or "natural" to buy at the ask and sell at the bid.
+        """
+        if rank_by not in RANK_BY:
+            raise ValueError(f"rank_by must be one of {RANK_BY}")
+        if fill not in ("mid", "natural"):
+            raise ValueError("fill must be 'mid' or 'natural'")
+        max_width = max_width if max_width is not None else 0.10 * self.market.spot
+        buy = self._ask if fill == "natural" else self._mid
+        sell = self._bid if fill == "natural" else self._mid
+        prune = {"max_width": max_width, "min_credit": min_credit, "max_debit": max_debit,
+                 "short_delta": short_delta, "buy": buy, "sell": sell}
+
+        scored = []
+        with instr.timer("strategies.search"):
+            verticals = self._verticals(prune) if {"vertical", "iron_condor"} & set(kinds) else None
+            for kind in kinds:
+                if kind == "vertical":
+                    legs, qty, cost = verticals
+                    debit = cost > 0
+                    ok = (debit & _le(cost, max_debit)) | (~debit & (-cost >= min_credit))
+                    legs, qty, cost = legs[ok], qty[ok], cost[ok]
+                elif kind == "iron_condor":
+                    legs, qty, cost = self._condors(verticals, prune, max_sides)
+                elif kind == "butterfly":
+                    legs, qty, cost = self._butterflies(prune)
+                elif kind == "calendar":
+                    legs, qty, cost = self._calendars(prune)
+                else:
+                    raise ValueError(f"Unknown strategy kind {kind!r}; choose from {KINDS}")
+                instr.count(f"strategies.candidates.{kind}", len(cost))
+                if len(cost):
+                    score = self._score_calendar(legs, qty, cost) if kind == "calendar" \
+                        else self._score_expiring(legs, qty, cost)
+                    scored.append((kind, legs, qty, cost, score))
+
+        if not scored:
+            return _empty_result()
+
+        # --- combine, filter, rank ---
+        kind = np.concatenate([np.full(len(c), k) for k, _, _, c, _ in scored])
+        legs = np.concatenate([_pad(lg, -1) for _, lg, _, _, _ in scored])
+        qty = np.concatenate([_pad(q, 0.0) for _, _, q, _, _ in scored])
+        cost = np.concatenate([c for _, _, _, c, _ in scored])
+        stats = {k: np.concatenate([s[k] for *_, s in scored]) for k in ("ev", "pop", "max_profit", "max_loss")}
+        greeks = {g: (self._greeks[g][np.maximum(legs, 0)] * qty).sum(axis=1) for g in GREEKS}
+        with np.errstate(divide="ignore", invalid="ignore"):
+            stats["ev_to_risk"] = np.where(stats["max_loss"] > 0, stats["ev"] / stats["max_loss"], np.inf)
+
+        keep = np.isfinite(stats["ev"])
+        if max_loss is not None:
+            keep &= stats["max_loss"] <= max_loss
+        if min_pop is not None:
+            keep &= stats["pop"] >= min_pop
+        if max_abs_delta is not None:
+            keep &= np.abs(greeks["delta"]) <= max_abs_delta
+        if max_abs_vega is not None:
+            keep &= np.abs(greeks["vega"]) <= max_abs_vega
+
+        rows = np.nonzero(keep)[0]
+        rows = rows[np.argsort(-stats[rank_by][rows], kind="stable")[:top]]
+        instr.count("strategies.scored", len(cost))
+
+        return pd.DataFrame({
+            "kind": kind[rows],
+            "expiry": [self.expiries[self._exp[legs[i, 1 if kind[i] == "calendar" else 0]]] for i in rows],
+            "legs": [self._describe(legs[i], qty[i], kind[i] == "calendar") for i in rows],
+            "cost": cost[rows],
+            **{k: v[rows] for k, v in stats.items()},
+            **{g: v[rows] for g, v in greeks.items()},
+        }).reset_index(drop=True)
+
+    # --- enumeration ---
+    def _groups(self):
+        # quote indices per (expiry, type), sorted by strike
+        order = np.lexsort((self._K, self._call, self._exp))
+        key = self._exp[order] * 2 + self._call[order]
+        bounds = np.flatnonzero(np.diff(key)) + 1
+        return np.split(order, bounds)
+
+    def _short_ok(self, idx, short_delta):
+        d = np.abs(self._greeks["delta"][idx])
+        return (d >= short_delta[0]) & (d <= short_delta[1])
+
+    def _verticals(self, prune):
+        # every ordered (long, short) pair of one expiry and type within max_width
+        legs = []
+        for group in self._groups():
+            i, j = np.triu_indices(len(group), 1)
+            near = self._K[group[j]] - self._K[group[i]] <= prune["max_width"]
+            lo, hi = group[i[near]], group[j[near]]
+            legs.append(np.column_stack([np.concatenate([lo, hi]), np.concatenate([hi, lo])]))
+        legs = np.concatenate(legs) if legs else np.empty((0, 2), dtype=int)
+        qty = np.tile([1.0, -1.0], (len(legs), 1))
+        cost = prune["buy"][legs[:, 0]] - prune["sell"][legs[:, 1]]
+        width = np.abs(self._K[legs[:, 0]] - self._K[legs[:, 1]])
+
+        # a debit or credit at least as wide as the spread is a bad quote
+        ok = (np.abs(cost) < width) & (cost != 0) & self._short_ok(legs[:, 1], prune["short_delta"])
+        return legs[ok], qty[ok], cost[ok]
+
+    def _condors(self, verticals, prune, max_sides):
+        legs, qty, cost = verticals
+        long_k, short_k = self._K[legs[:, 0]], self._K[legs[:, 1]]
+        call = self._call[legs[:, 1]]
+        credit = -cost
+        width = np.abs(long_k - short_k)
+        put_side = ~call & (credit > 0) & (long_k < short_k)
+        call_side = call & (credit > 0) & (long_k > short_k)
+        exp = self._exp[legs[:, 0]]
+
+        out = []
+        for e in np.unique(exp):
+            puts = _best(np.flatnonzero(put_side & (exp == e)), credit / width, max_sides)
+            calls = _best(np.flatnonzero(call_side & (exp == e)), credit / width, max_sides)
+            if not len(puts) or not len(calls):
+                continue
+            p, c = np.meshgrid(puts, calls, indexing="ij")
+            p, c = p.ravel(), c.ravel()
+            ok = (short_k[p] < short_k[c]) & (credit[p] + credit[c] >= prune["min_credit"])
+            out.append(np.column_stack([legs[p[ok]], legs[c[ok]]]))
+
+        legs4 = np.concatenate(out) if out else np.empty((0, 4), dtype=int)
+        qty4 = np.tile([1.0, -1.0, 1.0, -1.0], (len(legs4), 1))
+        cost4 = (prune["buy"][legs4[:, [0, 2]]].sum(axis=1) - prune["sell"][legs4[:, [1, 3]]].sum(axis=1))
+        return legs4, qty4, cost4
+
+    def _butterflies(self, prune):
+        # long K-w, short 2x K, long K+w on strikes that exist in the chain
+        legs = []
+        for group in self._groups():
+            K = self._K[group]
+            lo, mid = np.triu_indices(len(group), 1)
+            near = K[mid] - K[lo] <= prune["max_width"]
+            lo, mid = lo[near], mid[near]
+            target = 2 * K[mid] - K[lo]
+            hi = np.minimum(np.searchsorted(K, target), len(K) - 1)
+            ok = np.isclose(K[hi], target)
+            legs.append(np.column_stack([group[lo[ok]], group[mid[ok]], group[hi[ok]]]))
+        legs = np.concatenate(legs) if legs else np.empty((0, 3), dtype=int)
+        qty = np.tile([1.0, -2.0, 1.0], (len(legs), 1))
+        cost = (prune["buy"][legs[:, 0]] + prune["buy"][legs[:, 2]] - 2 * prune["sell"][legs[:, 1]])
+        wing = self._K[legs[:, 1]] - self._K[legs[:, 0]]
+        ok = (cost > 0) & (cost < wing) & _le(cost, prune["max_debit"]) \
+            & self._short_ok(legs[:, 1], prune["short_delta"])
+        return legs[ok], qty[ok], cost[ok]
+
+    def _calendars(self, prune):
+        # short the near expiry, long a later one, same strike and type
+        q = pd.DataFrame({"i": np.arange(len(self._K)), "exp": self._exp, "K": self._K, "call": self._call})
+        pairs = q.merge(q, on=["K", "call"], suffixes=("_near", "_far"))
+        pairs = pairs[pairs["exp_near"] < pairs["exp_far"]]
+        legs = pairs[["i_near", "i_far"]].to_numpy(dtype=int)[:, ::-1]
+        legs = np.ascontiguousarray(legs)
+        qty = np.tile([1.0, -1.0], (len(legs), 1))
+        cost = prune["buy"][legs[:, 0]] - prune["sell"][legs[:, 1]]
+        ok = (cost > 0) & _le(cost, prune["max_debit"]) & self._short_ok(legs[:, 1], prune["short_delta"])
+        return legs[ok], qty[ok], cost[ok]
+
+    # --- scoring ---
+    def _score_expiring(self, legs, qty, cost):
+        K = self._K[legs]
+        call = self._call[legs]
+        exp = self._exp[legs[:, 0]]
+        growth = self._growth[exp]
+
+        # P&L is linear between strikes: evaluate it at 0, each strike and the top of the grid
+        top = np.maximum(self._grid[exp, -1], K.max(axis=1) * 1.01)
+        X = np.column_stack([np.zeros(len(K)), np.sort(K, axis=1), top])
+        pnl = _payoff(X, K, call, qty) - (cost * growth)[:, None]
+        F = self._cdf(X, exp)
+
+        a, b, pa, pb = X[:, :-1], X[:, 1:], pnl[:, :-1], pnl[:, 1:]
+        up, dn = pa > 0, pb > 0
+        with np.errstate(divide="ignore", invalid="ignore"):
+            x0 = np.where(up != dn, a + (b - a) * pa / (pa - pb), a)
+        F0 = self._cdf(x0, exp)
+        mass = np.where(up & dn, F[:, 1:] - F[:, :-1],
+                        np.where(up, F0 - F[:, :-1], np.where(dn, F[:, 1:] - F0, 0.0)))
+        pop = mass.sum(axis=1) + np.where(pnl[:, -1] > 0, 1.0 - F[:, -1], 0.0)
+
+        ev = (self._exp_payoff[legs] * qty).sum(axis=1) - cost * growth
+        return {"ev": ev, "pop": pop, "max_profit": pnl.max(axis=1), "max_loss": np.maximum(-pnl.min(axis=1), 0.0)}
+
+    def _score_calendar(self, legs, qty, cost, chunk=2_000):
+        out = {k: np.empty(len(cost)) for k in ("ev", "pop", "max_profit", "max_loss")}
+        m = self.market
+        for s in range(0, len(cost), chunk):
+            near, far = legs[s:s + chunk, 1], legs[s:s + chunk, 0]
+            e1, e2 = self._exp[near], self._exp[far]
+            S = self._grid[e1]
+            K = self._K[near][:, None]
+            call = self._call[near][:, None]
+            short = np.where(call, np.maximum(S - K, 0.0), np.maximum(K - S, 0.0))
+            tau = (self._T[e2] - self._T[e1])[:, None]
+            fwd = np.log(self._growth[e2] / self._growth[e1])[:, None] / tau
+            long = kernels.bs_price(S, K, tau, fwd, m.div_yield, self._iv[far][:, None], call)
+            debit = cost[s:s + chunk] * self._growth[e1]
+            pnl = long - short - debit[:, None]
+            out["ev"][s:s + chunk] = pnl.mean(axis=1)
+            out["pop"][s:s + chunk] = (pnl > 0).mean(axis=1)
+            out["max_profit"][s:s + chunk] = pnl.max(axis=1)
+            # a same-strike calendar can't lose more than its debit; the grid alone understates that
+            out["max_loss"][s:s + chunk] = np.maximum(-pnl.min(axis=1), debit)
+        return out
+
+    def _cdf(self, x, exp):
+        out = np.empty_like(x)
+        for e in np.unique(exp):
+            rows = exp == e
+            out[rows] = np.interp(x[rows], self._grid[e], self._p, left=0.0, right=1.0)
+        return out
+
+    def _describe(self, legs, qty, with_expiry):
+        parts = []
+        for i, n in zip(legs, qty):
+            if i < 0:
+                continue
+            leg = f"{n:+g} {self._K[i]:g}{'C' if self._call[i] else 'P'}"
+            if with_expiry:
+                leg += f" {self.expiries[self._exp[i]]}"
+            parts.append(leg)
+        return " / ".join(parts)
+
+
+def _prepare_quotes(chain, market, strike_window, max_dte, min_mid, max_spread_pct):
+    df = chain[(chain["bid"] > 0) & (chain["ask"] >= chain["bid"]) & (chain["mid"] >= min_mid)]
+    df = df[(df["ask"] - df["bid"]) / df["mid"] <= max_spread_pct]
+    if strike_window is not None:
+        df = df[(df["strike"] - market.spot).abs() <= strike_window * market.spot]
+    days = np.array([(e - market.asof).days for e in df["expiry"]], dtype=float)
+    keep = (days > 0) & (days <= max_dte) if max_dte is not None else days > 0
+    df = df[keep].copy()
+    df["T"] = days[keep] / 365.0
+    df["is_call"] = df["option_type"] == OptionType.CALL.value
+
+    S, K, T = market.spot, df["strike"].to_numpy(dtype=float), df["T"].to_numpy()
+    is_call = df["is_call"].to_numpy()
+    df["iv"] = kernels.implied_vol(df["mid"].to_numpy(dtype=float), S, K, T, market.rate_at(T), market.div_yield,
+                                   is_call)
+    df = df[np.isfinite(df["iv"]) & (df["iv"] > 0)]
+
+    T = df["T"].to_numpy()
+    g = kernels.bs_greeks(S, df["strike"].to_numpy(dtype=float), T, market.rate_at(T),
+                          market.div_yield, df["iv"].to_numpy(), df["is_call"].to_numpy())
+    for name in GREEKS:
+        df[name] = g[name]
+    cols = ["expiry", "T", "strike", "option_type", "is_call", "bid", "ask", "mid", "iv", *GREEKS]
+    return df[cols].reset_index(drop=True)
+
+
+def _payoff(X, K, call, qty):
+    # sum of leg payoffs at each point of X (rows = candidates)
+    X, K, call, qty = X[:, :, None], K[:, None, :], call[:, None, :], qty[:, None, :]
+    return (qty * np.where(call, np.maximum(X - K, 0.0), np.maximum(K - X, 0.0))).sum(axis=2)
+
+
+def _best(rows, score, n):
+    if len(rows) <= n:
+        return rows
+    return rows[np.argpartition(-score[rows], n)[:n]]
+
+
+def _le(x, bound):
+    return x <= bound if bound is not None else np.ones(len(x), dtype=bool)
+
+
+def _pad(a, fill, width=4):
+    out = np.full((len(a), width), fill, dtype=a.dtype)
+    out[:, :a.shape[1]] = a
+    return out
+
+
+def _empty_result():
+    return pd.DataFrame(columns=["kind", "expiry", "legs", "cost", "ev", "pop", "max_profit", "max_loss",
+                                 "ev_to_risk", *GREEKS])
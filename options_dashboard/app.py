@@ -1,7 +1,10 @@
+from options_dashboard.core import instrumentation as instr
 from options_dashboard.ui.cli import run
 
 def main():
     run()
+    if instr.is_enabled():
+        print(instr.report())
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
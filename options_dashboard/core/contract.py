@@ -1,12 +1,52 @@
 from options_dashboard.core.types import OptionType
 
 class Contract:
-    def __init__(self, strike, expiry, option_type: OptionType, exercise_style,):
-        self.strike = strike
-        self.expiry = expiry
-        self.option_type = option_type
-        self.exercise_style = exercise_style
+    # immutable, hashable value type so contracts can key pricing caches
+    __slots__ = ("strike", "expiry", "option_type", "exercise_style", "barrier", "barrier_type")
+
+    def __init__(self, strike, expiry, option_type: OptionType, exercise_style, barrier=None, barrier_type=None):
+        set_ = object.__setattr__
+        set_(self, "strike", float(strike))
+        set_(self, "expiry", expiry)
+        set_(self, "option_type", option_type)
+        set_(self, "exercise_style", exercise_style)
+        # barrier_type: "up-and-out", "down-and-out", "up-and-in" or "down-and-in"
+        set_(self, "barrier", None if barrier is None else float(barrier))
+        set_(self, "barrier_type", barrier_type)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Contract is immutable; use replace()")
+
+    def __delattr__(self, name):
+        raise AttributeError("Contract is immutable; use replace()")
+
+    def _key(self):
+        return (self.strike, self.expiry, self.option_type, self.exercise_style, self.barrier, self.barrier_type)
+
+    def __eq__(self, other):
+        if not isinstance(other, Contract):
+            return NotImplemented
+        return self._key() == other._key()
+
+    def __hash__(self):
+        return hash(self._key())
+
+    def __repr__(self):
+        return (f"Contract(strike={self.strike!r}, expiry={self.expiry!r}, option_type={self.option_type}, "
+                f"exercise_style={self.exercise_style!r})")
+
+    def __reduce__(self):
+        return (Contract, self._key())
+
+    def replace(self, **changes):
+        fields = dict(zip(self.__slots__, self._key()))
+        fields.update(changes)
+        return Contract(**fields)
 
     def time_to_expiry(self, market):
         days = (self.expiry - market.asof).days
-        return max(days / 365.0, 0.0)
\ No newline at end of file
+        return max(days / 365.0, 0.0)
+
+    def is_american(self):
+        style = getattr(self.exercise_style, "value", self.exercise_style)
+        return str(style).lower() == "american"
\ No newline at end of file
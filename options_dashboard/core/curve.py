@@ -0,0 +1,77 @@
+import numpy as np
+
+
+class YieldCurve:
+    """
+    Zero curve from (tenor in years, continuously compounded zero rate) points.
+
+    Interpolation is linear in log discount factor, i.e. piecewise-flat
+    forwards between tenors; the first forward runs back to T=0 and the
+    zero rate is held flat past the last tenor. Lookups take scalars or
+    arrays of T (np.interp), so a whole chain discounts in one call.
+
+    Immutable and hashable like MarketData, which carries it.
+    """
+    __slots__ = ("tenors", "rates", "asof", "_t", "_log_df")
+
+    def __init__(self, tenors, rates, asof=None):
+        tenors = np.asarray(tenors, dtype=float)
+        rates = np.asarray(rates, dtype=float)
+        if tenors.ndim != 1 or tenors.shape != rates.shape or tenors.size == 0:
+            raise ValueError("tenors and rates must be matching non-empty 1-D sequences")
+        if np.any(tenors <= 0):
+            raise ValueError("tenors must be positive")
+        order = np.argsort(tenors)
+
+        set_ = object.__setattr__
+        set_(self, "tenors", tuple(tenors[order].tolist()))
+        set_(self, "rates", tuple(rates[order].tolist()))
+        set_(self, "asof", asof)
+        set_(self, "_t", np.concatenate([[0.0], tenors[order]]))
+        set_(self, "_log_df", np.concatenate([[0.0], -rates[order] * tenors[order]]))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("YieldCurve is immutable")
+
+    def __eq__(self, other):
+        if not isinstance(other, YieldCurve):
+            return NotImplemented
+        return (self.tenors, self.rates, self.asof) == (other.tenors, other.rates, other.asof)
+
+    def __hash__(self):
+        return hash((self.tenors, self.rates, self.asof))
+
+    def __repr__(self):
+        points = ", ".join(f"{t:g}y={r:.4%}" for t, r in zip(self.tenors, self.rates))
+        return f"YieldCurve({points}, asof={self.asof!r})"
+
+    def __reduce__(self):
+        return (YieldCurve, (self.tenors, self.rates, self.asof))
+
+    # --- lookups ---
+    def log_discount(self, T):
+        T = np.asarray(T, dtype=float)
+        inside = np.interp(T, self._t, self._log_df)
+        out = np.where(T > self._t[-1], -self.rates[-1] * T, inside)
+        return float(out) if out.ndim == 0 else out
+
+    def discount(self, T):
+        out = np.exp(self.log_discount(T))
+        return float(out) if np.ndim(out) == 0 else out
+
+    def zero_rate(self, T):
+        T = np.asarray(T, dtype=float)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            out = np.where(T > 0, -np.asarray(self.log_discount(T)) / T, self.rates[0])
+        return float(out) if out.ndim == 0 else out
+
+    def forward_rate(self, T1, T2):
+        """Continuously compounded forward rate between T1 and T2 (T2 > T1)."""
+        T1 = np.asarray(T1, dtype=float)
+        T2 = np.asarray(T2, dtype=float)
+        out = (np.asarray(self.log_discount(T1)) - np.asarray(self.log_discount(T2))) / (T2 - T1)
+        return float(out) if out.ndim == 0 else out
+
+    def shifted(self, shift):
+        """Parallel shift of every zero rate by `shift` (absolute, e.g. 0.0001 = 1bp)."""
+        return YieldCurve(self.tenors, [r + shift for r in self.rates], self.asof)
@@ -0,0 +1,175 @@
+"""
+Lightweight timing / counting hooks for the data -> IV -> pricing pipeline.
+
+Everything is off by default (or enabled with OPTIONS_DASHBOARD_PROFILE=1).
+While disabled, timer() hands back a shared no-op object and count()/timed
+return after a single flag check, so the hooks can stay in hot paths.
+"""
+import cProfile
+import functools
+import io
+import json
+import os
+import pstats
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+
+_enabled = os.environ.get("OPTIONS_DASHBOARD_PROFILE", "") not in ("", "0")
+
+_timings = defaultdict(lambda: [0, 0.0, float("inf"), 0.0])   # name -> [calls, total, min, max]
+_counters = defaultdict(int)
+_trace = deque(maxlen=100_000)                                  # (name, start, duration)
+_t0 = time.perf_counter()
+
+
+def enable():
+    global _enabled
+    _enabled = True
+
+
+def disable():
+    global _enabled
+    _enabled = False
+
+
+def is_enabled():
+    return _enabled
+
+
+def reset():
+    global _t0
+    _timings.clear()
+    _counters.clear()
+    _trace.clear()
+    _t0 = time.perf_counter()
+
+
+# --- recording ---
+def record(name, elapsed, start=None):
+    stats = _timings[name]
+    stats[0] += 1
+    stats[1] += elapsed
+    stats[2] = min(stats[2], elapsed)
+    stats[3] = max(stats[3], elapsed)
+    if start is not None:
+        _trace.append((name, start, elapsed))
+
+
+def count(name, n=1):
+    if _enabled:
+        _counters[name] += n
+
+
+class _Timer:
+    __slots__ = ("name", "start")
+
+    def __init__(self, name):
+        self.name = name
+        self.start = None
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        record(self.name, time.perf_counter() - self.start, self.start)
+        return False
+
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+def timer(name):
+    """Context manager timing a block under `name` (no-op while disabled)."""
+    return _Timer(name) if _enabled else _NULL_TIMER
+
+
+def timed(name=None):
+    """Decorator version of timer(); defaults to module.qualname."""
+    def wrap(fn):
+        label = name or f"{fn.__module__}.{fn.__qualname__}"
+
+        @functools.wraps(fn)
+        def inner(*args, **kwargs):
+            if not _enabled:
+                return fn(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                record(label, time.perf_counter() - start, start)
+        return inner
+    return wrap
+
+
+# --- reporting ---
+def summary():
+    """Snapshot of timings and counters as plain dicts."""
+    timings = {
+        name: {"calls": n, "total": total, "mean": total / n, "min": lo, "max": hi}
+        for name, (n, total, lo, hi) in _timings.items() if n
+    }
+    return {"timings": timings, "counters": dict(_counters)}
+
+
+def report():
+    """Human-readable table of stage timings (slowest first) and counters."""
+    snap = summary()
+    lines = [f"{'stage':<40}{'calls':>8}{'total s':>12}{'mean ms':>12}{'max ms':>12}"]
+    for name, s in sorted(snap["timings"].items(), key=lambda kv: -kv[1]["total"]):
+        lines.append(f"{name:<40}{s['calls']:>8}{s['total']:>12.4f}{s['mean'] * 1e3:>12.3f}{s['max'] * 1e3:>12.3f}")
+    if snap["counters"]:
+        lines.append("")
+        lines.append(f"{'counter':<40}{'value':>8}")
+        for name, value in sorted(snap["counters"].items()):
+            lines.append(f"{name:<40}{value:>8}")
+    return "\n".join(lines)
+
+
+def export_json(path):
+    """
+    Write the summary plus recorded spans in Chrome trace format
+    (open with chrome://tracing or Perfetto).
+    """
+    events = [
+        {"name": name, "ph": "X", "ts": (start - _t0) * 1e6, "dur": elapsed * 1e6, "pid": os.getpid(), "tid": 0}
+        for name, start, elapsed in _trace
+    ]
+    with open(path, "w") as fh:
+        json.dump({"traceEvents": events, "summary": summary()}, fh, indent=1)
+    return path
+
+
+@contextmanager
+def profile(path=None, sort="cumulative", limit=30):
+    """
+    cProfile a block. Dumps raw stats to `path` if given (for snakeviz etc.);
+    the formatted top `limit` rows are available as .text on the yielded object.
+    """
+    result = _ProfileResult()
+    prof = cProfile.Profile()
+    prof.enable()
+    try:
+        yield result
+    finally:
+        prof.disable()
+        if path is not None:
+            prof.dump_stats(path)
+        buf = io.StringIO()
+        pstats.Stats(prof, stream=buf).sort_stats(sort).print_stats(limit)
+        result.text = buf.getvalue()
+
+
+class _ProfileResult:
+    text = ""
@@ -1,22 +1,77 @@
+import itertools
 import math
 
+_snapshot_ids = itertools.count(1)
+
 class MarketData:
-    def __init__(self, asof, spot, rate, div_yield = 0.0, vol = None, vol_surface = None):
-        self.asof = asof
-        self.spot = spot
-        self.rate = rate
-        self.div_yield = div_yield
-        self.vol = vol
-        self.vol_surface = vol_surface
+    # immutable, hashable snapshot; every directly constructed MarketData is a new
+    # snapshot (snapshot_id), while replace() copies stay on their parent's snapshot.
+    # With a YieldCurve attached, discounting and forwards read the zero rate to each
+    # maturity from the curve; `rate` is then just the short end.
+    __slots__ = ("asof", "spot", "rate", "div_yield", "vol", "vol_surface", "curve", "snapshot_id")
+
+    _FIELDS = ("asof", "spot", "rate", "div_yield", "vol", "vol_surface", "curve")
+
+    def __init__(self, asof, spot, rate, div_yield = 0.0, vol = None, vol_surface = None, curve = None,
+                 snapshot_id = None):
+        set_ = object.__setattr__
+        set_(self, "asof", asof)
+        set_(self, "spot", spot)
+        set_(self, "rate", rate)
+        set_(self, "div_yield", div_yield)
+        set_(self, "vol", vol)
+        set_(self, "vol_surface", vol_surface)
+        set_(self, "curve", curve)
+        set_(self, "snapshot_id", snapshot_id if snapshot_id is not None else next(_snapshot_ids))
 
         if self.vol is None and self.vol_surface is None:
             raise ValueError("Must provide vol or vol_surface")
+
+    def __setattr__(self, name, value):
+        raise AttributeError("MarketData is immutable; use replace()")
+
+    def __delattr__(self, name):
+        raise AttributeError("MarketData is immutable; use replace()")
+
+    def _key(self):
+        return tuple(getattr(self, f) for f in self._FIELDS)
+
+    # snapshot_id is bookkeeping, not part of the value
+    def __eq__(self, other):
+        if not isinstance(other, MarketData):
+            return NotImplemented
+        return self._key() == other._key()
+
+    def __hash__(self):
+        return hash(self._key())
+
+    def __repr__(self):
+        return (f"MarketData(asof={self.asof!r}, spot={self.spot!r}, rate={self.rate!r}, "
+                f"div_yield={self.div_yield!r}, vol={self.vol!r}, snapshot_id={self.snapshot_id})")
+
+    def __reduce__(self):
+        return (MarketData, self._key() + (self.snapshot_id,))
+
+    def replace(self, new_snapshot=False, **changes):
+        # copy of this snapshot with some fields swapped out (e.g. a bumped spot);
+        # new_snapshot=True marks it as fresh market data rather than a scenario
+        fields = dict(zip(self._FIELDS, self._key()))
+        fields.update(changes)
+        return MarketData(**fields, snapshot_id=None if new_snapshot else self.snapshot_id)
     
+    def rate_at(self, T):
+        # continuously compounded zero rate to T (scalar or array)
+        if self.curve is not None:
+            return self.curve.zero_rate(T)
+        return self.rate
+
     def discount(self, T):
+        if self.curve is not None:
+            return self.curve.discount(T)
         return math.exp(-self.rate * T)
     
     def forward(self, T):
-        return self.spot * math.exp((self.rate - self.div_yield)*T)
+        return self.spot * math.exp((self.rate_at(T) - self.div_yield)*T)
     
     def sigma(self, strike, T):
         if self.vol_surface is not None:
@@ -0,0 +1,115 @@
+import datetime as dt
+import json
+import math
+import os
+from pathlib import Path
+
+import pandas_datareader.data as pdr
+
+from options_dashboard.core import instrumentation as instr
+from options_dashboard.core.curve import YieldCurve
+
+CACHE_PATH = Path(os.environ.get("OPTIONS_DASHBOARD_CURVE", Path.home() / ".options_dashboard" / "curve.json"))
+
+# FRED series -> tenor in years; SOFR anchors the overnight end, Treasury CMT the rest
+FRED_TENORS = {
+    "SOFR": 1 / 365, "DGS1MO": 1 / 12, "DGS3MO": 0.25, "DGS6MO": 0.5, "DGS1": 1.0, "DGS2": 2.0,
+    "DGS3": 3.0, "DGS5": 5.0, "DGS7": 7.0, "DGS10": 10.0, "DGS20": 20.0, "DGS30": 30.0,
+}
+
+# offline fallback when there is no cache yet (percent, same shape as a FRED pull)
+FIXTURE = {
+    "SOFR": 4.30, "DGS1MO": 4.30, "DGS3MO": 4.25, "DGS6MO": 4.15, "DGS1": 4.00, "DGS2": 3.90,
+    "DGS3": 3.85, "DGS5": 3.90, "DGS7": 4.00, "DGS10": 4.15, "DGS20": 4.50, "DGS30": 4.55,
+}
+
+_memo = {}
+
+
+@instr.timed("data.get_curve")
+def get_curve(asof=None, offline=None, path=None):
+    """
+    Zero curve built from the latest SOFR and Treasury CMT points on FRED.
+
+    The downloaded points are cached as JSON (CACHE_PATH, or
+    OPTIONS_DASHBOARD_CURVE) and refreshed at most once per day; a failed
+    refresh falls back to the stale cache. offline=True (or
+    OPTIONS_DASHBOARD_OFFLINE=1) never touches the network: it uses the
+    cache, or the FIXTURE points when there is none.
+    """
+    asof = asof or dt.date.today()
+    path = Path(path) if path is not None else CACHE_PATH
+    if offline is None:
+        offline = os.environ.get("OPTIONS_DASHBOARD_OFFLINE", "") not in ("", "0")
+
+    key = (str(path), asof, offline)
+    if key in _memo:
+        return _memo[key]
+
+    cached = _read(path)
+    if cached is not None and (offline or cached["fetched"] == asof.isoformat()):
+        instr.count("curve.cache_hits")
+        data = cached
+    elif offline:
+        data = {"fetched": None, "asof": None, "points": FIXTURE}
+    else:
+        try:
+            data = _download(asof)
+        except Exception:
+            # FRED unreachable: a day-old curve beats failing the session
+            if cached is None:
+                raise
+            instr.count("curve.stale")
+            data = cached
+        else:
+            _write(path, data)
+
+    curve = _build(data)
+    _memo[key] = curve
+    return curve
+
+
+def _download(asof):
+    # two weeks covers weekends/holidays; ffill picks the latest print per series
+    frame = pdr.DataReader(list(FRED_TENORS), "fred", asof - dt.timedelta(days=14), asof).ffill()
+    last = frame.dropna(how="all").iloc[-1].dropna()
+    instr.count("curve.downloads")
+    return {
+        "fetched": asof.isoformat(),
+        "asof": frame.dropna(how="all").index[-1].date().isoformat(),
+        "points": {name: float(value) for name, value in last.items()},
+    }
+
+
+def _build(data):
+    tenors, rates = [], []
+    for name, pct in data["points"].items():
+        if name not in FRED_TENORS or pct is None or not math.isfinite(pct):
+            continue
+        y = pct / 100
+        if name == "SOFR":
+            # simple ACT/360 overnight rate -> continuous
+            rate = math.log1p(y / 360) * 365
+        else:
+            # CMT yields are semiannual bond-equivalent; treated as zero rates
+            rate = 2 * math.log1p(y / 2)
+        tenors.append(FRED_TENORS[name])
+        rates.append(rate)
+    asof = dt.date.fromisoformat(data["asof"]) if data.get("asof") else None
+    return YieldCurve(tenors, rates, asof=asof)
+
+
+def _read(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write(path, data):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    with open(tmp, "w") as f:
+        json.dump(data, f, indent=1)
+    os.replace(tmp, path)
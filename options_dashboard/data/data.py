@@ -0,0 +1,138 @@
+import yfinance as yf
+import pandas as pd
+import math
+import time
+
+from options_dashboard.core import instrumentation as instr
+from options_dashboard.data.curve import get_curve
+
+@instr.timed("data.get_spot_and_history")
+def get_spot_and_history(ticker):
+    history = yf.Ticker(ticker).history(period='1y', interval='1d', actions=False)['Close']
+    spot = yf.Ticker(ticker).fast_info.get('lastPrice')
+    return spot, history
+
+class OptionChain:
+    """
+    Lazy handle on a ticker's option chain.
+
+    Listing expiries is one request; each expiry's calls and puts are only
+    downloaded when first asked for and are then memoized (for `max_age`
+    seconds), so pricing one contract costs one expiry download rather than
+    the whole chain. Strike windows are applied per expiry before frames
+    are concatenated.
+    """
+
+    def __init__(self, ticker, max_age=300.0):
+        self.ticker = ticker.upper()
+        self.max_age = max_age
+        self._tkr = yf.Ticker(self.ticker)
+        self._expiries = None
+        self._frames = {}
+
+    @property
+    def expiries(self):
+        if self._expiries is None:
+            self._expiries = {pd.to_datetime(exp).date(): exp for exp in self._tkr.options}
+        return list(self._expiries)
+
+    def expiry(self, expiry):
+        """Cleaned calls and puts for one expiry (memoized)."""
+        expiry = pd.to_datetime(expiry).date()
+        cached = self._frames.get(expiry)
+        if cached is not None and time.monotonic() - cached[0] <= self.max_age:
+            instr.count("data.expiry_cache_hits")
+            return cached[1]
+        if expiry not in self.expiries:
+            raise ValueError(f"No {self.ticker} options expiring {expiry}")
+
+        oc = self._tkr.option_chain(self._expiries[expiry])
+        instr.count("data.expiry_downloads")
+
+        calls = oc.calls.copy()
+        calls["option_type"] = "call"
+
+        puts = oc.puts.copy()
+        puts["option_type"] = "put"
+
+        df = pd.concat([calls, puts], ignore_index=True)
+        df["expiry"] = expiry
+
+        df = df[df["bid"].notna() & df["ask"].notna()]
+        df = df[(df["bid"] > 0) & (df["ask"] > 0)]
+        df["mid"] = (df["bid"] + df["ask"]) / 2
+        df = df[df["mid"] > 0]
+
+        self._frames[expiry] = (time.monotonic(), df)
+        return df
+
+    def frame(self, expiries=None, strike_min=None, strike_max=None, option_type=None):
+        """
+        Chain rows for `expiries` (all by default), optionally restricted to
+        a strike window and one option type ("call"/"put" or OptionType).
+        """
+        expiries = self.expiries if expiries is None else [pd.to_datetime(e).date() for e in expiries]
+        option_type = getattr(option_type, "value", option_type)
+        frames = []
+        for expiry in expiries:
+            if expiry not in self.expiries:
+                continue
+            df = self.expiry(expiry)
+            if strike_min is not None:
+                df = df[df["strike"] >= float(strike_min)]
+            if strike_max is not None:
+                df = df[df["strike"] <= float(strike_max)]
+            if option_type is not None:
+                df = df[df["option_type"] == option_type]
+            frames.append(df)
+        if not frames:
+            return pd.DataFrame(columns=["strike", "bid", "ask", "mid", "option_type", "expiry"])
+        return pd.concat(frames, ignore_index=True)
+
+    def mid(self, expiry, strike, opt_type):
+        return get_mid_from_chain(self.expiry(expiry), expiry, strike, opt_type)
+
+    def refresh(self):
+        self._expiries = None
+        self._frames.clear()
+
+
+_chains = {}
+
+
+def get_chain(ticker, refresh=False):
+    """
+    Session-wide OptionChain handle for `ticker`. Its quotes can be up to
+    max_age seconds old; refresh=True drops them so the next read downloads.
+    """
+    ticker = ticker.upper()
+    if ticker not in _chains:
+        _chains[ticker] = OptionChain(ticker)
+    elif refresh:
+        _chains[ticker].refresh()
+    return _chains[ticker]
+
+
+@instr.timed("data.get_option_chain")
+def get_option_chain(ticker, expiries=None):
+    # fresh download of the whole chain, or only `expiries`
+    return OptionChain(ticker).frame(expiries)
+
+@instr.timed("data.get_rate")
+def get_rate(T=None):
+    # short (SOFR) rate by default, or the zero rate to maturity T, off the cached curve
+    return get_curve().zero_rate(T if T is not None else 0.0)
+
+@instr.timed("data.get_div_yield")
+def get_div_yield(ticker):
+    div_yield = yf.Ticker(ticker).info.get('dividendYield')
+    return 0.0 if div_yield is None else math.log(1 + div_yield)
+
+def get_mid_from_chain(chain, expiry, strike, opt_type):
+    # chain: a chain DataFrame, or an OptionChain (only `expiry` gets loaded)
+    if isinstance(chain, OptionChain):
+        chain = chain.expiry(expiry)
+    row = chain[(chain["expiry"] == expiry) & (chain["strike"] == strike) & (chain["option_type"] == opt_type)]
+    if row.empty:
+        raise ValueError("No matching option found")
+    return float(row["mid"].iloc[0])
\ No newline at end of file
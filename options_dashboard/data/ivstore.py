@@ -0,0 +1,254 @@
+import datetime as dt
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from options_dashboard.core import instrumentation as instr
+
+DEFAULT_ROOT = Path(os.environ.get("OPTIONS_DASHBOARD_STORE", Path.home() / ".options_dashboard" / "ivstore"))
+ATM_TENORS = (30, 60, 90)
+
+_EPOCH = dt.date(1970, 1, 1)
+_EPOCH_DT = dt.datetime(1970, 1, 1)
+_TYPE_CODES = {"call": 0, "put": 1}
+_TYPE_NAMES = np.array(["call", "put"])
+
+
+class IVStore:
+    """
+    Append-only local history of IV points and surface summaries.
+
+    Layout (one directory per ticker):
+      <root>/<TICKER>/points/<YYYY-MM-DD>_<HHMMSSffffff>.npz   compressed columns, one file per snapshot
+      <root>/<TICKER>/summary.npz                              one row per snapshot: ATM term IVs + params
+
+    Range queries over the summary ("ATM 30d IV for the last year", IV rank)
+    only ever touch the one small summary file; raw points are read per day.
+    Appends never rewrite earlier point files, so an intraday refresh loop
+    costs the same per snapshot however many are already stored; only the
+    small summary file is rewritten.
+    """
+
+    def __init__(self, root=None):
+        self.root = Path(root) if root is not None else DEFAULT_ROOT
+
+    def _ticker_dir(self, ticker):
+        return self.root / ticker.upper()
+
+    # --- writes ---
+    def append(self, ticker, points, spot, asof=None, params=None):
+        """
+        Store one snapshot of build_iv_points output.
+
+        asof: datetime of the snapshot (defaults to now); each snapshot gets
+        its own points file, named by date and time of day.
+        params: optional dict of extra surface parameters (floats) to keep
+        alongside the ATM term IVs in the summary.
+        """
+        asof = asof or dt.datetime.now()
+        if not isinstance(asof, dt.datetime):
+            asof = dt.datetime.combine(asof, dt.time())
+        ts = _to_ts(asof)
+
+        with instr.timer("ivstore.append"):
+            self._append_points(ticker, points, asof, ts)
+
+            row = {"ts": ts, "spot": float(spot)}
+            for days in ATM_TENORS:
+                row[f"atm_iv_{days}d"] = atm_iv(points, spot, days)
+            for name, value in (params or {}).items():
+                row[name] = float(value)
+            self._append_summary(ticker, row)
+
+    def _append_points(self, ticker, points, asof, ts):
+        path = self._ticker_dir(ticker) / "points" / f"{asof:%Y-%m-%d_%H%M%S%f}.npz"
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        option_type = points["option_type"].map(lambda t: getattr(t, "value", t))
+        cols = {
+            "ts": np.full(len(points), ts, dtype=np.int64),
+            "expiry": np.array([(e - _EPOCH).days for e in points["expiry"]], dtype=np.int32),
+            "T": points["T"].to_numpy(dtype=np.float64),
+            "strike": points["strike"].to_numpy(dtype=np.float64),
+            "option_type": option_type.map(_TYPE_CODES).to_numpy(dtype=np.int8),
+            "mid": points["mid"].to_numpy(dtype=np.float64),
+            "iv": points["iv"].to_numpy(dtype=np.float32),
+        }
+        _atomic_savez(path, cols)
+
+    def _append_summary(self, ticker, row):
+        path = self._ticker_dir(ticker) / "summary.npz"
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        if path.exists():
+            with np.load(path) as old:
+                cols = {k: old[k] for k in old.files}
+        else:
+            cols = {"ts": np.empty(0, dtype=np.int64)}
+        n = len(cols["ts"])
+
+        # new parameter names get back-filled with NaN
+        for name in row:
+            if name not in cols:
+                cols[name] = np.full(n, np.nan)
+        cols = {
+            k: np.append(v, row.get(k, np.nan)).astype(np.int64 if k == "ts" else np.float64)
+            for k, v in cols.items()
+        }
+        _atomic_savez(path, cols)
+
+    # --- reads ---
+    def tickers(self):
+        if not self.root.exists():
+            return []
+        return sorted(p.name for p in self.root.iterdir() if (p / "summary.npz").exists())
+
+    def summary(self, ticker, start=None, end=None):
+        """All snapshot summaries as a DataFrame indexed by timestamp."""
+        path = self._ticker_dir(ticker) / "summary.npz"
+        if not path.exists():
+            return pd.DataFrame()
+        with np.load(path) as data:
+            cols = {k: data[k] for k in data.files}
+
+        ts = cols.pop("ts")
+        lo, hi = _ts_bounds(start, end)
+        order = np.argsort(ts, kind="stable")
+        ts = ts[order]
+        i, j = np.searchsorted(ts, lo, "left"), np.searchsorted(ts, hi, "right")
+        index = pd.to_datetime(ts[i:j], unit="s")
+        return pd.DataFrame({k: v[order][i:j] for k, v in cols.items()}, index=index)
+
+    def series(self, ticker, field="atm_iv_30d", start=None, end=None, daily=True):
+        """
+        Time series of one summary field, e.g. ATM 30d IV over the last year:
+            store.series("SPY", "atm_iv_30d", start=today - timedelta(days=365))
+        daily=True keeps the last snapshot of each day.
+        """
+        df = self.summary(ticker, start, end)
+        if df.empty or field not in df:
+            return pd.Series(dtype=float, name=field)
+        s = df[field].dropna()
+        if daily:
+            s = s.groupby(s.index.normalize()).last()
+        return s.rename(field)
+
+    def points(self, ticker, start=None, end=None):
+        """Raw IV points for the days in [start, end]."""
+        folder = self._ticker_dir(ticker) / "points"
+        if not folder.exists():
+            return pd.DataFrame()
+
+        lo = start.isoformat()[:10] if start is not None else ""
+        hi = end.isoformat()[:10] if end is not None else "9999"
+        frames = []
+        for path in sorted(folder.glob("*.npz")):
+            day = _file_day(path)
+            if day is None or not (lo <= day <= hi):
+                continue
+            with np.load(path) as data:
+                frames.append({k: data[k] for k in data.files})
+        if not frames:
+            return pd.DataFrame()
+
+        cols = {k: np.concatenate([f[k] for f in frames]) for k in frames[0]}
+        return pd.DataFrame({
+            "asof": pd.to_datetime(cols["ts"], unit="s"),
+            "expiry": [_EPOCH + dt.timedelta(days=int(d)) for d in cols["expiry"]],
+            "T": cols["T"],
+            "strike": cols["strike"],
+            "option_type": _TYPE_NAMES[cols["option_type"]],
+            "mid": cols["mid"],
+            "iv": cols["iv"].astype(np.float64),
+        })
+
+    # --- screens ---
+    def iv_rank(self, ticker, value=None, field="atm_iv_30d", lookback_days=365, asof=None):
+        """(value - min) / (max - min) over the lookback; value defaults to the latest."""
+        hist, value = self._lookback(ticker, value, field, lookback_days, asof)
+        if hist.size == 0:
+            return float("nan")
+        lo, hi = hist.min(), hist.max()
+        return float((value - lo) / (hi - lo)) if hi > lo else float("nan")
+
+    def iv_percentile(self, ticker, value=None, field="atm_iv_30d", lookback_days=365, asof=None):
+        """Fraction of days in the lookback with IV below value (latest by default)."""
+        hist, value = self._lookback(ticker, value, field, lookback_days, asof)
+        if hist.size == 0:
+            return float("nan")
+        return float(np.searchsorted(np.sort(hist), value, "left") / hist.size)
+
+    def _lookback(self, ticker, value, field, lookback_days, asof):
+        end = asof or dt.datetime.now()
+        start = end - dt.timedelta(days=lookback_days)
+        s = self.series(ticker, field, start=start, end=end)
+        hist = s.to_numpy(dtype=float)
+        if value is None:
+            value = hist[-1] if hist.size else float("nan")
+        return hist, float(value)
+
+
+def atm_iv(points, spot, days):
+    """
+    ATM IV at a constant tenor: per expiry, IV interpolated linearly in strike
+    at spot, then total variance interpolated linearly in T.
+    """
+    if points is None or len(points) == 0:
+        return float("nan")
+
+    terms = []
+    for T, grp in points.groupby("T", sort=True):
+        smile = grp.groupby("strike")["iv"].mean()
+        strikes = smile.index.to_numpy(dtype=float)
+        if not (strikes[0] <= spot <= strikes[-1]):
+            continue
+        terms.append((float(T), float(np.interp(spot, strikes, smile.to_numpy(dtype=float)))))
+    if not terms:
+        return float("nan")
+
+    T = np.array([t for t, _ in terms])
+    var = np.array([v * v * t for t, v in terms])
+    target = days / 365.0
+    if target <= T[0]:
+        return float(terms[0][1])
+    if target >= T[-1]:
+        return float(terms[-1][1])
+    return float(np.sqrt(np.interp(target, T, var) / target))
+
+
+def _ts_bounds(start, end):
+    def to_ts(x, default, is_end):
+        if x is None:
+            return default
+        if not isinstance(x, dt.datetime):
+            # a bare date covers the whole day
+            x = dt.datetime.combine(x, dt.time.max if is_end else dt.time())
+        return _to_ts(x)
+    return to_ts(start, np.iinfo(np.int64).min, False), to_ts(end, np.iinfo(np.int64).max, True)
+
+
+def _to_ts(x):
+    # naive wall-clock seconds, matching pd.to_datetime(..., unit="s") on the way out
+    return int((x.replace(tzinfo=None) - _EPOCH_DT).total_seconds())
+
+
+def _file_day(path):
+    # "<YYYY-MM-DD>_<HHMMSSffffff>" (or a bare "<YYYY-MM-DD>" day file from older
+    # stores) -> the ISO day; anything else, e.g. a temp file left by a crash, -> None
+    day, _, snap = path.stem.partition("_")
+    try:
+        dt.date.fromisoformat(day)
+    except ValueError:
+        return None
+    return day if snap == "" or snap.isdigit() else None
+
+
+def _atomic_savez(path, cols):
+    # write next to the target then swap in, so a crash never leaves half a file;
+    # the temp name doesn't end in .npz, so readers never pick it up
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "wb") as f:
+        np.savez_compressed(f, **cols)
+    os.replace(tmp, path)
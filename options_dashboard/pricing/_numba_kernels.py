@@ -0,0 +1,175 @@
+"""
+numba implementations behind options_dashboard.pricing.kernels.
+
+Imported lazily by kernels._backend(); every kernel is compiled with
+cache=True so the machine code is reused across runs. Inputs are 1-D
+contiguous float64 arrays (bool for is_call), already broadcast.
+"""
+import math
+
+import numba
+import numpy as np
+
+_SQRT2 = math.sqrt(2.0)
+_SQRT2PI = math.sqrt(2.0 * math.pi)
+
+
+@numba.njit(cache=True)
+def _ncdf(x):
+    return 0.5 * math.erfc(-x / _SQRT2)
+
+
+@numba.njit(cache=True)
+def _npdf(x):
+    return math.exp(-0.5 * x * x) / _SQRT2PI
+
+
+@numba.njit(cache=True)
+def _price(S, K, T, r, q, sigma, is_call):
+    if T <= 0.0:
+        return max(S - K, 0.0) if is_call else max(K - S, 0.0)
+    vol_t = sigma * math.sqrt(T)
+    d1 = (math.log(S / K) + (r - q + 0.5 * sigma * sigma) * T) / vol_t
+    d2 = d1 - vol_t
+    if is_call:
+        return S * math.exp(-q * T) * _ncdf(d1) - K * math.exp(-r * T) * _ncdf(d2)
+    return K * math.exp(-r * T) * _ncdf(-d2) - S * math.exp(-q * T) * _ncdf(-d1)
+
+
+@numba.njit(parallel=True, cache=True)
+def bs_price(S, K, T, r, q, sigma, is_call):
+    n = S.size
+    out = np.empty(n)
+    for i in numba.prange(n):
+        out[i] = _price(S[i], K[i], T[i], r[i], q[i], sigma[i], is_call[i])
+    return out
+
+
+@numba.njit(parallel=True, cache=True)
+def bs_greeks(S, K, T, r, q, sigma, is_call):
+    n = S.size
+    out = np.empty((7, n))
+    for i in numba.prange(n):
+        s, k, t, rr, qq, sig = S[i], K[i], T[i], r[i], q[i], sigma[i]
+        sqrt_t = math.sqrt(t)
+        vol_t = sig * sqrt_t
+        d1 = (math.log(s / k) + (rr - qq + 0.5 * sig * sig) * t) / vol_t
+        d2 = d1 - vol_t
+        eq = math.exp(-qq * t)
+        er = math.exp(-rr * t)
+        pdf = _npdf(d1)
+        Nd1 = _ncdf(d1)
+        Nd2 = _ncdf(d2)
+        decay = -s * eq * pdf * sig / (2.0 * sqrt_t)
+
+        out[0, i] = _price(s, k, t, rr, qq, sig, is_call[i])
+        out[2, i] = eq * pdf / (sig * s * sqrt_t)
+        out[3, i] = s * sqrt_t * eq * pdf
+        out[6, i] = -eq * pdf * d2 / sig
+        if is_call[i]:
+            out[1, i] = eq * Nd1
+            out[4, i] = -(decay - rr * k * er * Nd2 + qq * s * eq * Nd1) / 365.0
+            out[5, i] = k * t * er * Nd2 / 100.0
+        else:
+            out[1, i] = eq * (Nd1 - 1.0)
+            out[4, i] = -(decay + rr * k * er * (1.0 - Nd2) - qq * s * eq * (1.0 - Nd1)) / 365.0
+            out[5, i] = -k * t * er * (1.0 - Nd2) / 100.0
+    return out
+
+
+@numba.njit(parallel=True, cache=True)
+def bs_gamma(S, K, T, r, q, sigma):
+    n = S.size
+    out = np.empty(n)
+    for i in numba.prange(n):
+        vol_t = sigma[i] * math.sqrt(T[i])
+        d1 = (math.log(S[i] / K[i]) + (r[i] - q[i] + 0.5 * sigma[i] * sigma[i]) * T[i]) / vol_t
+        out[i] = math.exp(-q[i] * T[i]) * _npdf(d1) / (S[i] * vol_t)
+    return out
+
+
+@numba.njit(cache=True)
+def _implied_vol(price, S, K, T, r, q, is_call, tol, max_iter, sigma_min, sigma_max):
+    fS = S * math.exp(-q * T)
+    fK = K * math.exp(-r * T)
+    if is_call:
+        lower, upper = max(fS - fK, 0.0), fS
+    else:
+        lower, upper = max(fK - fS, 0.0), fK
+    if T <= 0.0 or not (lower < price < upper):
+        return np.nan
+
+    # Corrado-Miller start (Brenner-Subrahmanyam where it degenerates)
+    call = price if is_call else price + fS - fK
+    x = call - 0.5 * (fS - fK)
+    disc = max(x * x - (fS - fK) ** 2 / math.pi, 0.0)
+    sigma = math.sqrt(2.0 * math.pi / T) / (fS + fK) * (x + math.sqrt(disc))
+    if not (sigma > 0.0) or not math.isfinite(sigma):
+        sigma = math.sqrt(2.0 * math.pi / T) * call / fS
+    if not (sigma > 0.0) or not math.isfinite(sigma):
+        sigma = 0.2
+    sigma = min(max(sigma, sigma_min), sigma_max)
+
+    lo, hi = sigma_min, sigma_max
+    for _ in range(max_iter):
+        err = _price(S, K, T, r, q, sigma, is_call) - price
+        if abs(err) < tol:
+            return sigma
+        if err > 0.0:
+            hi = sigma
+        else:
+            lo = sigma
+
+        sqrt_t = math.sqrt(T)
+        d1 = (math.log(S / K) + (r - q + 0.5 * sigma * sigma) * T) / (sigma * sqrt_t)
+        d2 = d1 - sigma * sqrt_t
+        vega = S * sqrt_t * math.exp(-q * T) * _npdf(d1)
+
+        new = -1.0
+        if vega > 1e-12:
+            newton = err / vega
+            denom = 1.0 - 0.5 * newton * d1 * d2 / sigma
+            new = sigma - (newton / denom if denom > 0.5 else newton)
+        if not (lo < new < hi):
+            new = 0.5 * (lo + hi)
+        sigma = new
+        if hi - lo < 1e-10:
+            return sigma
+    return np.nan
+
+
+@numba.njit(parallel=True, cache=True)
+def implied_vol(price, S, K, T, r, q, is_call, tol, max_iter, sigma_min, sigma_max):
+    n = price.size
+    out = np.empty(n)
+    for i in numba.prange(n):
+        out[i] = _implied_vol(price[i], S[i], K[i], T[i], r[i], q[i], is_call[i],
+                              tol, max_iter, sigma_min, sigma_max)
+    return out
+
+
+@numba.njit(parallel=True, cache=True)
+def binomial_price(S, K, T, r, q, sigma, is_call, american, steps):
+    n = S.size
+    out = np.empty(n)
+    for i in numba.prange(n):
+        sign = 1.0 if is_call[i] else -1.0
+        if T[i] <= 0.0:
+            out[i] = max(sign * (S[i] - K[i]), 0.0)
+            continue
+        dt = T[i] / steps
+        u = math.exp(sigma[i] * math.sqrt(dt))
+        p = (math.exp((r[i] - q[i]) * dt) - 1.0 / u) / (u - 1.0 / u)
+        disc = math.exp(-r[i] * dt)
+
+        values = np.empty(steps + 1)
+        for j in range(steps + 1):
+            values[j] = max(sign * (S[i] * u ** (2 * j - steps) - K[i]), 0.0)
+        for step in range(steps - 1, -1, -1):
+            for j in range(step + 1):
+                v = disc * (p * values[j + 1] + (1.0 - p) * values[j])
+                if american:
+                    v = max(v, sign * (S[i] * u ** (2 * j - step) - K[i]))
+                values[j] = v
+        out[i] = values[0]
+    return out
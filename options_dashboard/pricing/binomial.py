@@ -0,0 +1,43 @@
+import numpy as np
+
+from options_dashboard.core.types import OptionType
+from options_dashboard.pricing import kernels
+from options_dashboard.pricing.cache import cached
+
+
+class BinomialPricer:
+    """
+    Cox-Ross-Rubinstein lattice pricer for European and American exercise,
+    backed by the array kernels (compiled when numba is available).
+    """
+
+    def __init__(self, steps=200, cache=None):
+        self.steps = steps
+        self.cache = cache
+
+    @cached
+    def price(self, contract, market, sigma_overide=None):
+        return float(self.price_many([contract], market, sigma_overide)[0])
+
+    def price_many(self, contracts, market, sigma_overide=None):
+        """Price a list of contracts in one kernel call; returns an array."""
+        contracts = list(contracts)
+        strike = np.array([float(c.strike) for c in contracts])
+        T = np.array([c.time_to_expiry(market) for c in contracts])
+        if sigma_overide is not None:
+            sigma = np.broadcast_to(np.asarray(sigma_overide, dtype=float), strike.shape)
+        else:
+            sigma = np.array([market.sigma(K, t) for K, t in zip(strike, T)], dtype=float)
+        is_call = np.array([c.option_type is OptionType.CALL for c in contracts])
+        american = np.array([c.is_american() for c in contracts])
+
+        out = np.empty(len(contracts))
+        # the lattice kernel takes one exercise style per call
+        for style in (False, True):
+            mask = american == style
+            if mask.any():
+                out[mask] = kernels.binomial_price(
+                    market.spot, strike[mask], T[mask], market.rate_at(T[mask]), market.div_yield,
+                    sigma[mask], is_call[mask], american=style, steps=self.steps,
+                )
+        return out
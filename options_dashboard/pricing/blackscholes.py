@@ -1,15 +1,23 @@
 import math
 import statistics as stats
+from options_dashboard.core import instrumentation as instr
 from options_dashboard.core.types import OptionType
+from options_dashboard.pricing.cache import cached
 
 class BlackScholesPricer:
+    def __init__(self, cache=None):
+        # optional PricingCache; None prices everything fresh
+        self.cache = cache
+
+    @cached
     def price(self, contract, market, sigma_overide=None):
+        instr.count("bs.price")
         option_type = contract.option_type
         S = market.spot
         E = float(contract.strike)
-        r = market.rate
         D = market.div_yield
         T = contract.time_to_expiry(market)
+        r = market.rate_at(T)
 
         # use override if provided
         sigma = sigma_overide if sigma_overide is not None else market.sigma(E, T)
@@ -25,14 +33,17 @@ class BlackScholesPricer:
             raise ValueError('Option type specified incorrectly')
         
         return value
-    def delta(self, contract, market):
+    @cached
+    def delta(self, contract, market, sigma_overide=None):
         option_type = contract.option_type
         S = market.spot
         E = float(contract.strike)
-        r = market.rate
         D = market.div_yield
         T = contract.time_to_expiry(market)
-        sigma = market.sigma(E, T)
+        r = market.rate_at(T)
+
+        # use override if provided
+        sigma = sigma_overide if sigma_overide is not None else market.sigma(E, T)
 
         d_1 = (math.log(S/E) + ((r - D + (0.5*sigma**2))*(T))) / (sigma*math.sqrt(T))
 
@@ -44,14 +55,17 @@ class BlackScholesPricer:
             raise ValueError("Option type specified incorrectly")
         
         return delta
-    def gamma(self, contract, market):
+    @cached
+    def gamma(self, contract, market, sigma_overide=None):
         option_type = contract.option_type
         S = market.spot
         E = float(contract.strike)
-        r = market.rate
         D = market.div_yield
         T = contract.time_to_expiry(market)
-        sigma = market.sigma(E, T)
+        r = market.rate_at(T)
+
+        # use override if provided
+        sigma = sigma_overide if sigma_overide is not None else market.sigma(E, T)
 
         d_1 = (math.log(S/E) + ((r - D + (0.5*sigma**2))*(T))) / (sigma*math.sqrt(T))
 
@@ -63,14 +77,17 @@ class BlackScholesPricer:
             raise ValueError("Option type specified incorrectly")
         
         return gamma
-    def theta(self, contract, market):
+    @cached
+    def theta(self, contract, market, sigma_overide=None):
         option_type = contract.option_type
         S = market.spot
         E = float(contract.strike)
-        r = market.rate
         D = market.div_yield
         T = contract.time_to_expiry(market)
-        sigma = market.sigma(E, T)
+        r = market.rate_at(T)
+
+        # use override if provided
+        sigma = sigma_overide if sigma_overide is not None else market.sigma(E, T)
 
         d_1 = (math.log(S/E) + ((r - D + (0.5*sigma**2))*(T))) / (sigma*math.sqrt(T))
         d_2 = d_1 - (sigma*math.sqrt(T))
@@ -78,18 +95,19 @@ class BlackScholesPricer:
         if option_type is OptionType.CALL:
             theta = -(1/365)*((-(sigma*S*math.exp(-D*T)*stats.NormalDist(0,1).pdf(d_1))/(2*math.sqrt(T))) + (D*S*stats.NormalDist(0,1).cdf(d_1)*math.exp(-D*T)) - (r*E*math.exp(-r*T)*stats.NormalDist(0,1).cdf(d_2)))
         elif option_type is OptionType.PUT:
-            theta = -(1/365)*((-(sigma*S*math.exp(-D*T)*stats.NormalDist(0,1).pdf(-d_1))/(2*math.sqrt(T))) + (D*S*stats.NormalDist(0,1).cdf(-d_1)*math.exp(-D*T)) - (r*E*math.exp(-r*T)*stats.NormalDist(0,1).cdf(-d_2)))
+            theta = -(1/365)*((-(sigma*S*math.exp(-D*T)*stats.NormalDist(0,1).pdf(-d_1))/(2*math.sqrt(T))) - (D*S*stats.NormalDist(0,1).cdf(-d_1)*math.exp(-D*T)) + (r*E*math.exp(-r*T)*stats.NormalDist(0,1).cdf(-d_2)))
         else:
             raise ValueError("Option type specified incorrectly")
         
         return theta
+    @cached
     def vega(self, contract, market, sigma_overide=None):
         option_type = contract.option_type
         S = market.spot
         E = float(contract.strike)
-        r = market.rate
         D = market.div_yield
         T = contract.time_to_expiry(market)
+        r = market.rate_at(T)
 
         # use override if provided
         sigma = sigma_overide if sigma_overide is not None else market.sigma(E, T)
@@ -104,14 +122,17 @@ class BlackScholesPricer:
             raise ValueError("Option type specified incorrectly")
         
         return vega
-    def rho(self, contract, market):
+    @cached
+    def rho(self, contract, market, sigma_overide=None):
         option_type = contract.option_type
         S = market.spot
         E = float(contract.strike)
-        r = market.rate
         D = market.div_yield
         T = contract.time_to_expiry(market)
-        sigma = market.sigma(E, T)
+        r = market.rate_at(T)
+
+        # use override if provided
+        sigma = sigma_overide if sigma_overide is not None else market.sigma(E, T)
 
         d_1 = (math.log(S/E) + ((r - D + (0.5*sigma**2))*(T))) / (sigma*math.sqrt(T))
         d_2 = d_1 - (sigma*math.sqrt(T))
@@ -125,90 +146,182 @@ class BlackScholesPricer:
         
         return rho
 
+    @instr.timed("bs.implied_vol")
     def implied_vol(self, contract, market, market_price,
-                sigma0=0.15, tol=1e-6, max_iter=50,
+                sigma0=None, tol=1e-6, max_iter=50,
                 sigma_min=1e-6, sigma_max=5.0,
-                bisect_max_iter=100):
-        # helper: pricing error as a function of sigma
-        def f(sig: float) -> float:
-            return self.price(contract, market, sigma_overide=sig) - market_price
+                bisect_max_iter=100, full_output=False):
+        """
+        Solve for the Black-Scholes vol that reproduces market_price.
+
+        Starts from a Corrado-Miller closed-form guess (unless sigma0 is given),
+        takes safeguarded Halley steps using vega and volga, and falls back to
+        Brent's method on the bracket collected so far if Halley misbehaves.
+        Returns NaN for prices outside the no-arbitrage bounds.
+
+        With full_output=True returns (iv, info) where info holds
+        "method", "iterations", "evaluations", "residual" and "converged".
+        """
+        S = market.spot
+        E = float(contract.strike)
+        D = market.div_yield
+        T = contract.time_to_expiry(market)
+        r = market.rate_at(T)
+        option_type = contract.option_type
+        info = {"method": None, "iterations": 0, "evaluations": 0, "residual": float("nan"), "converged": False}
+
+        def done(sigma, method, residual, converged=True):
+            info.update(method=method, residual=residual, converged=converged)
+            instr.count("bs.iv.evaluations", info["evaluations"])
+            instr.count(f"bs.iv.method.{method}")
+            return (sigma, info) if full_output else sigma
+
+        # helper: pricing error (plus vega/volga) as a function of sigma
+        def f(sig):
+            info["evaluations"] += 1
+            return _price_vega_volga(option_type, S, E, r, D, T, sig, market_price)
+
+        # --- 0) NO-ARBITRAGE BOUNDS ---
+        fwd_S = S * math.exp(-D * T)
+        fwd_E = E * math.exp(-r * T)
+        if option_type is OptionType.CALL:
+            lower, upper = max(fwd_S - fwd_E, 0.0), fwd_S
+        elif option_type is OptionType.PUT:
+            lower, upper = max(fwd_E - fwd_S, 0.0), fwd_E
+        else:
+            raise ValueError("Option type specified incorrectly")
 
-        # --- 1) NEWTON TRY ---
-        sigma = float(sigma0)
-        last_err = None
+        if T <= 0 or not (lower < market_price < upper):
+            instr.count("bs.iv.out_of_bounds")
+            return done(float("nan"), "bounds", float("nan"), converged=False)
 
+        # --- 1) INITIAL GUESS ---
+        if sigma0 is None:
+            sigma0 = _corrado_miller_guess(option_type, market_price, fwd_S, fwd_E, T)
+        sigma = min(max(float(sigma0), sigma_min), sigma_max)
+
+        # --- 2) SAFEGUARDED HALLEY ---
+        # price is increasing in sigma, so each evaluation tightens a bracket
+        lo, f_lo = sigma_min, None
+        hi, f_hi = sigma_max, None
         for _ in range(max_iter):
-            err = f(sigma)
+            info["iterations"] += 1
+            err, v, volga = f(sigma)
 
             if abs(err) < tol:
-                return sigma
+                return done(sigma, "halley", err)
 
-            v = self.vega(contract, market, sigma_overide=sigma)
+            if err > 0:
+                hi, f_hi = sigma, err
+            else:
+                lo, f_lo = sigma, err
 
-            # Newton failure conditions
             if (not math.isfinite(err)) or (not math.isfinite(v)) or (v < 1e-10):
                 break
 
-            step = err / v
+            newton = err / v
+            denom = 1.0 - 0.5 * newton * volga / v
+            # Halley correction only when it doesn't flip or blow up the Newton step
+            step = newton / denom if denom > 0.5 else newton
             sigma_new = sigma - step
 
-            # If Newton jumps out of bounds or doesn't improve, bail to bisection
-            if (sigma_new <= sigma_min) or (sigma_new >= sigma_max):
+            if not (lo < sigma_new < hi):
                 break
-            if last_err is not None and abs(err) >= abs(last_err) * 0.999:
-                # not improving (or improving too slowly) -> fallback
-                break
-
             sigma = sigma_new
-            last_err = err
-
-        # --- 2) BISECTION FALLBACK ---
-        # Find a bracket [lo, hi] such that f(lo) <= 0 <= f(hi) (or vice-versa)
-        lo = sigma_min
-        hi = min(max(sigma0, 0.3), sigma_max)  # start hi somewhat reasonable
-
-        f_lo = f(lo)
-        f_hi = f(hi)
-
-        # Expand hi until we bracket, or hit sigma_max
-        # (for deep OTM options you may need large vol to raise price)
-        expand_count = 0
-        while f_lo * f_hi > 0 and hi < sigma_max and expand_count < 30:
-            hi = min(hi * 2.0, sigma_max)
-            f_hi = f(hi)
-            expand_count += 1
-
-        # If still no bracket, try shrinking lo upward (rare case where f(lo)>0)
-        # This can happen if market_price is below intrinsic/arb, or pricing mismatch.
-        if f_lo * f_hi > 0:
-            lo2 = 1e-4
-            while f_lo * f_hi > 0 and lo2 < hi:
-                lo2 *= 2.0
-                f_lo = f(lo2)
-            lo = lo2
-
-        # If we cannot bracket, return NaN (or raise) — market price likely inconsistent
-        if not (math.isfinite(f_lo) and math.isfinite(f_hi)) or f_lo * f_hi > 0:
-            return float("nan")
 
-        # Standard bisection
-        for _ in range(bisect_max_iter):
-            mid = 0.5 * (lo + hi)
-            f_mid = f(mid)
+        # --- 3) BRENT FALLBACK ---
+        instr.count("bs.iv.brent_fallbacks")
+        if f_lo is None:
+            f_lo = f(lo)[0]
+        if f_hi is None:
+            f_hi = f(hi)[0]
 
-            if abs(f_mid) < tol:
-                return mid
+        # If we cannot bracket, return NaN — market price likely inconsistent
+        if not (math.isfinite(f_lo) and math.isfinite(f_hi)) or f_lo * f_hi > 0:
+            instr.count("bs.iv.no_bracket")
+            return done(float("nan"), "brent", float("nan"), converged=False)
+
+        def g(sig):
+            info["iterations"] += 1
+            return f(sig)[0]
+
+        sigma, residual = _brent(g, lo, hi, f_lo, f_hi, tol, bisect_max_iter)
+        return done(sigma, "brent", residual, converged=abs(residual) < tol)
+
+
+def _price_vega_volga(option_type, S, E, r, D, T, sigma, target=0.0):
+    # one pass of the shared d1/d2 terms: (price - target, vega, volga)
+    sqrt_T = math.sqrt(T)
+    d_1 = (math.log(S/E) + ((r - D + (0.5*sigma**2))*(T))) / (sigma*sqrt_T)
+    d_2 = d_1 - (sigma*sqrt_T)
+    N = stats.NormalDist(0,1)
+
+    if option_type is OptionType.CALL:
+        value = (S*math.exp(-D*T)*N.cdf(d_1))-(E*math.exp(-r*T)*N.cdf(d_2))
+    else:
+        value = (-S*math.exp(-D*T)*N.cdf(-d_1))+(E*math.exp(-r*T)*N.cdf(-d_2))
+    instr.count("bs.price")
+
+    vega = S*sqrt_T*math.exp(-D*T)*N.pdf(d_1)
+    volga = vega * d_1 * d_2 / sigma
+    return value - target, vega, volga
+
+
+def _corrado_miller_guess(option_type, price, fwd_S, fwd_E, T):
+    # Corrado-Miller (1996) works on the call; map puts through parity
+    call = price if option_type is OptionType.CALL else price + fwd_S - fwd_E
+    half_gap = 0.5 * (fwd_S - fwd_E)
+    x = call - half_gap
+    disc = x * x - (fwd_S - fwd_E) ** 2 / math.pi
+    guess = math.sqrt(2 * math.pi / T) / (fwd_S + fwd_E) * (x + math.sqrt(max(disc, 0.0)))
+    if not math.isfinite(guess) or guess <= 0:
+        # Brenner-Subrahmanyam ATM approximation
+        guess = math.sqrt(2 * math.pi / T) * call / fwd_S
+    return guess if math.isfinite(guess) and guess > 0 else 0.2
+
+
+def _brent(f, a, b, f_a, f_b, tol, max_iter):
+    # Brent's method on a bracket [a, b] with f(a)*f(b) <= 0; returns (root, f(root))
+    if abs(f_a) < abs(f_b):
+        a, b, f_a, f_b = b, a, f_b, f_a
+    c, f_c = a, f_a
+    d = e = b - a
+
+    for _ in range(max_iter):
+        if abs(f_b) < tol:
+            return b, f_b
+        if f_a != f_c and f_b != f_c:
+            # inverse quadratic interpolation
+            s = (a*f_b*f_c/((f_a-f_b)*(f_a-f_c)) + b*f_a*f_c/((f_b-f_a)*(f_b-f_c))
+                 + c*f_a*f_b/((f_c-f_a)*(f_c-f_b)))
+        else:
+            # secant
+            s = b - f_b*(b-a)/(f_b-f_a)
+
+        lo_bound = (3*a + b) / 4
+        use_bisect = (
+            not (min(lo_bound, b) < s < max(lo_bound, b))
+            or abs(s - b) >= abs(e) / 2
+            or abs(e) < 1e-12
+        )
+        if use_bisect:
+            s = 0.5 * (a + b)
+            e = b - a
+        else:
+            e = d
+        d = b - s
 
-            # Keep the sub-interval that brackets the root
-            if f_lo * f_mid <= 0:
-                hi = mid
-                f_hi = f_mid
-            else:
-                lo = mid
-                f_lo = f_mid
+        f_s = f(s)
+        c, f_c = b, f_b
+        if f_a * f_s < 0:
+            b, f_b = s, f_s
+        else:
+            a, f_a = s, f_s
+        if abs(f_a) < abs(f_b):
+            a, b, f_a, f_b = b, a, f_b, f_a
 
-            # Optional: interval width stop
-            if (hi - lo) < 1e-10:
-                return 0.5 * (lo + hi)
+        # interval width stop
+        if abs(b - a) < 1e-10:
+            return b, f_b
 
-        return 0.5 * (lo + hi)
+    return b, f_b
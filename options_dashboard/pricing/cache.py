@@ -0,0 +1,101 @@
+import functools
+from collections import OrderedDict
+
+from options_dashboard.core import instrumentation as instr
+
+
+class PricingCache:
+    """
+    Bounded LRU cache of pricing results keyed on immutable
+    (method, contract, market, sigma) tuples.
+
+    Entries remember the MarketData snapshot they were computed on; the first
+    lookup against a newer snapshot drops everything older, so a dashboard
+    re-rendering the same positions only reprices when the market moves.
+    Bumped scenario copies (MarketData.replace) share their parent's snapshot
+    and don't trigger invalidation.
+    """
+
+    def __init__(self, maxsize=10_000):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._snapshot = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def get_or_compute(self, key, market, compute):
+        snapshot = market.snapshot_id
+        if snapshot > self._snapshot:
+            self.invalidate(before=snapshot)
+            self._snapshot = snapshot
+
+        try:
+            value = self._data[key][1]
+        except KeyError:
+            pass
+        else:
+            self._data.move_to_end(key)
+            self.hits += 1
+            instr.count("cache.hits")
+            return value
+
+        self.misses += 1
+        instr.count("cache.misses")
+        value = compute()
+        self._data[key] = (snapshot, value)
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+        return value
+
+    def invalidate(self, before=None):
+        """Drop entries computed on snapshots older than `before` (everything if None)."""
+        if before is None:
+            dropped = len(self._data)
+            self._data.clear()
+        else:
+            stale = [k for k, (snap, _) in self._data.items() if snap < before]
+            for k in stale:
+                del self._data[k]
+            dropped = len(stale)
+        if dropped:
+            self.invalidations += 1
+        return dropped
+
+    def clear(self):
+        self._data.clear()
+        self.hits = self.misses = self.evictions = self.invalidations = 0
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
+
+
+def cached(method):
+    """
+    Route pricer.method(contract, market, sigma_overide=None) through
+    pricer.cache when one is attached; a no-op otherwise.
+    """
+    name = method.__name__
+
+    @functools.wraps(method)
+    def inner(self, contract, market, sigma_overide=None):
+        cache = getattr(self, "cache", None)
+        if cache is None:
+            return method(self, contract, market, sigma_overide)
+        key = (name, contract, market, sigma_overide)
+        return cache.get_or_compute(key, market, lambda: method(self, contract, market, sigma_overide))
+    return inner
@@ -0,0 +1,296 @@
+import math
+
+import numpy as np
+import pandas as pd
+from scipy.interpolate import CubicSpline
+from scipy.linalg import solve_banded
+
+from options_dashboard.core import instrumentation as instr
+from options_dashboard.core.types import OptionType
+
+
+class FiniteDifferencePricer:
+    """
+    Crank-Nicolson PDE pricer for European/American vanillas and barriers.
+
+    The PDE is solved once per contract in normalised log-moneyness
+    x = ln(S/K) on a uniform grid, with Rannacher start-up (the first
+    rannacher_steps steps are replaced by pairs of implicit half-steps) to
+    damp the payoff kink, and a penalty iteration for the early-exercise
+    constraint. Each step is a banded (tridiagonal) LAPACK solve.
+
+    Vol comes from market.vol when flat, otherwise market.vol_surface.vol(S, t)
+    is evaluated at every grid node and read as a local vol.
+
+    Delta, gamma and theta come straight off the solved grid. With flat vol
+    the normalised solution doesn't depend on K, so price_strikes() prices a
+    whole expiry of vanillas from a single solve.
+    """
+
+    def __init__(self, n_space=400, n_time=200, n_sd=5.0, rannacher_steps=2,
+                 penalty=1e8, max_penalty_iter=25, cache=None):
+        self.n_space = n_space
+        self.n_time = n_time
+        self.n_sd = n_sd
+        self.rannacher_steps = rannacher_steps
+        self.penalty = penalty
+        self.max_penalty_iter = max_penalty_iter
+        self.cache = cache
+        self._last = (None, None)
+
+    # --- pricer interface ---
+    def price(self, contract, market):
+        return self.price_and_greeks(contract, market)["value"]
+
+    def delta(self, contract, market):
+        return self.price_and_greeks(contract, market)["delta"]
+
+    def gamma(self, contract, market):
+        return self.price_and_greeks(contract, market)["gamma"]
+
+    def theta(self, contract, market):
+        return self.price_and_greeks(contract, market)["theta"]
+
+    def price_and_greeks(self, contract, market):
+        """Returns {"value", "delta", "gamma", "theta"} from one grid solve."""
+        key = (contract, market)
+        if self._last[0] == key:
+            return dict(self._last[1])
+        if self.cache is not None:
+            result = self.cache.get_or_compute(("fd",) + key, market, lambda: self._price_and_greeks(contract, market))
+        else:
+            result = self._price_and_greeks(contract, market)
+        self._last = (key, result)
+        return dict(result)
+
+    def _price_and_greeks(self, contract, market):
+        barrier_type = contract.barrier_type
+        if barrier_type is not None and barrier_type.endswith("-in"):
+            # in-out parity: knock-in = vanilla - knock-out (European only)
+            if contract.is_american():
+                raise ValueError("American knock-in barriers are not supported")
+            out = _with_barrier(contract, barrier_type.replace("-in", "-out"))
+            vanilla = _with_barrier(contract, None)
+            v_out = self.price_and_greeks(out, market)
+            v_van = self.price_and_greeks(vanilla, market)
+            result = {k: v_van[k] - v_out[k] for k in v_van}
+        else:
+            result = self._price_group([contract], market)[0]
+        return result
+
+    def price_strikes(self, contracts, market):
+        """
+        Price many contracts, sharing one grid solve per (expiry, type, style)
+        group of vanillas when vol is flat. Returns a DataFrame with
+        expiry, strike, option_type, value, delta, gamma, theta.
+        """
+        contracts = list(contracts)
+        flat = market.vol_surface is None
+
+        groups = {}
+        for i, c in enumerate(contracts):
+            if flat and c.barrier_type is None:
+                key = (c.expiry, c.option_type, c.is_american())
+            else:
+                key = ("single", i)
+            groups.setdefault(key, []).append(i)
+
+        results = [None] * len(contracts)
+        for key, idx in groups.items():
+            if key[0] == "single":
+                results[idx[0]] = self.price_and_greeks(contracts[idx[0]], market)
+                continue
+            for i, res in zip(idx, self._price_group([contracts[i] for i in idx], market)):
+                results[i] = res
+
+        rows = []
+        for c, res in zip(contracts, results):
+            rows.append({"expiry": c.expiry, "strike": float(c.strike), "option_type": c.option_type.value, **res})
+        return pd.DataFrame(rows)
+
+    # --- grid solve ---
+    def _price_group(self, contracts, market):
+        # all contracts share expiry/type/style (and vol if more than one)
+        first = contracts[0]
+        T = first.time_to_expiry(market)
+        S = float(market.spot)
+        strikes = np.array([float(c.strike) for c in contracts])
+        x_spot = np.log(S / strikes)
+        is_call = first.option_type is OptionType.CALL
+        if first.option_type not in (OptionType.CALL, OptionType.PUT):
+            raise ValueError("Option type specified incorrectly")
+
+        if T <= 0:
+            return [_intrinsic(S, K, is_call) for K in strikes]
+
+        K_ref = strikes[0]
+        vol_fn, sig_ref = _vol_fn(market, K_ref, S, T)
+
+        # --- grid in x = ln(S/K) ---
+        width = max(self.n_sd * sig_ref * math.sqrt(T), 0.25)
+        x_lo = min(x_spot.min(), 0.0) - width
+        x_hi = max(x_spot.max(), 0.0) + width
+        knock_lo = knock_hi = False
+        if first.barrier_type is not None:
+            x_bar = math.log(float(first.barrier) / K_ref)
+            if first.barrier_type.startswith("down"):
+                if x_spot[0] <= x_bar:
+                    return [{"value": 0.0, "delta": 0.0, "gamma": 0.0, "theta": 0.0}]
+                x_lo, knock_lo = x_bar, True
+            else:
+                if x_spot[0] >= x_bar:
+                    return [{"value": 0.0, "delta": 0.0, "gamma": 0.0, "theta": 0.0}]
+                x_hi, knock_hi = x_bar, True
+        x = np.linspace(x_lo, x_hi, self.n_space + 1)
+
+        with instr.timer("fd.solve"):
+            v, v_prev, dt_last = self._solve(
+                x, T, market.rate_at(T), market.div_yield, vol_fn, is_call,
+                first.is_american(), knock_lo, knock_hi,
+            )
+        instr.count("fd.solves")
+
+        spline = CubicSpline(x, v)
+        spline_prev = CubicSpline(x, v_prev)
+        out = []
+        for K, xs in zip(strikes.tolist(), x_spot.tolist()):
+            d1 = float(spline(xs, 1))
+            d2 = float(spline(xs, 2))
+            out.append({
+                "value": K * float(spline(xs)),
+                "delta": K * d1 / S,
+                "gamma": K * (d2 - d1) / (S * S),
+                # value lost per calendar day, same convention as BlackScholesPricer.theta
+                "theta": K * (float(spline(xs)) - float(spline_prev(xs))) / (dt_last * 365.0),
+            })
+        return out
+
+    def _solve(self, x, T, r, D, vol_fn, is_call, american, knock_lo, knock_hi):
+        n = len(x)
+        dx = x[1] - x[0]
+        S = np.exp(x)
+        payoff = np.maximum(S - 1.0, 0.0) if is_call else np.maximum(1.0 - S, 0.0)
+
+        v = payoff.copy()
+        if knock_lo:
+            v[0] = 0.0
+        if knock_hi:
+            v[-1] = 0.0
+
+        dt = T / self.n_time
+        n_ran = min(self.rannacher_steps, self.n_time)
+        steps = [(0.5 * dt, 1.0)] * (2 * n_ran) + [(dt, 0.5)] * (self.n_time - n_ran)
+
+        tau = 0.0
+        coeffs = None
+        v_prev = v
+        for h, theta in steps:
+            tau_new = tau + h
+            t_mid = max(T - (tau + 0.5 * h), 0.0)
+
+            if coeffs is None or not vol_fn.flat:
+                sig2 = np.broadcast_to(vol_fn(S, t_mid), S.shape) ** 2
+                mu = r - D - 0.5 * sig2
+                a = (0.5 * sig2 / dx**2 - mu / (2 * dx))[1:-1]
+                b = (-sig2 / dx**2 - r)[1:-1]
+                c = (0.5 * sig2 / dx**2 + mu / (2 * dx))[1:-1]
+                coeffs = (a, b, c)
+            a, b, c = coeffs
+
+            # explicit half: rhs = v + (1 - theta) h L v
+            rhs = v.copy()
+            if theta < 1.0:
+                rhs[1:-1] += (1 - theta) * h * (a * v[:-2] + b * v[1:-1] + c * v[2:])
+            rhs[0], rhs[-1] = _boundaries(S[0], S[-1], tau_new, r, D, is_call, american, knock_lo, knock_hi)
+
+            # implicit half: banded (I - theta h L)
+            ab = np.zeros((3, n))
+            ab[1] = 1.0
+            ab[1, 1:-1] -= theta * h * b
+            ab[0, 2:] = -theta * h * c
+            ab[2, :-2] = -theta * h * a
+
+            v_prev = v
+            if american:
+                v = self._penalty_solve(ab, rhs, payoff)
+            else:
+                v = solve_banded((1, 1), ab, rhs, check_finite=False)
+            tau = tau_new
+
+        return v, v_prev, steps[-1][0]
+
+    def _penalty_solve(self, ab, rhs, payoff):
+        # Forsyth-Vetzal penalty: add a large diagonal where V < payoff until the active set settles
+        active = np.zeros(len(rhs), dtype=bool)
+        v = solve_banded((1, 1), ab, rhs, check_finite=False)
+        for _ in range(self.max_penalty_iter):
+            new_active = v < payoff
+            new_active[0] = new_active[-1] = False
+            if np.array_equal(new_active, active):
+                break
+            active = new_active
+            pen = np.where(active, self.penalty, 0.0)
+            ab_p = ab.copy()
+            ab_p[1] += pen
+            v = solve_banded((1, 1), ab_p, rhs + pen * payoff, check_finite=False)
+            instr.count("fd.penalty_iters")
+        return v
+
+
+class _VolFn:
+    def __init__(self, fn, flat):
+        self.fn = fn
+        self.flat = flat
+
+    def __call__(self, S, t):
+        return self.fn(S, t)
+
+
+def _vol_fn(market, K, spot, T):
+    # returns (vol as a function of normalised S and calendar t, reference vol for grid width)
+    if market.vol_surface is None:
+        sig = float(market.vol)
+        return _VolFn(lambda S, t: sig, True), sig
+
+    surface = market.vol_surface
+
+    def local_vol(S, t):
+        t = max(t, 1e-6)
+        try:
+            out = np.asarray(surface.vol(S * K, t), dtype=float)
+            if out.shape == S.shape:
+                return out
+        except (TypeError, ValueError):
+            pass
+        return np.array([surface.vol(s, t) for s in S * K], dtype=float)
+
+    return _VolFn(local_vol, False), float(surface.vol(spot, T))
+
+
+def _boundaries(S_lo, S_hi, tau, r, D, is_call, american, knock_lo, knock_hi):
+    # Dirichlet values (normalised, K=1) at the two ends of the grid
+    disc_r = math.exp(-r * tau)
+    disc_d = math.exp(-D * tau)
+    if is_call:
+        lo = 0.0
+        hi = S_hi * disc_d - disc_r
+        if american:
+            hi = max(hi, S_hi - 1.0)
+    else:
+        lo = disc_r - S_lo * disc_d
+        if american:
+            lo = max(lo, 1.0 - S_lo)
+        hi = 0.0
+    return (0.0 if knock_lo else lo), (0.0 if knock_hi else hi)
+
+
+def _intrinsic(S, K, is_call):
+    if is_call:
+        return {"value": max(S - K, 0.0), "delta": float(S > K), "gamma": 0.0, "theta": 0.0}
+    return {"value": max(K - S, 0.0), "delta": -float(S < K), "gamma": 0.0, "theta": 0.0}
+
+
+def _with_barrier(contract, barrier_type):
+    barrier = contract.barrier if barrier_type is not None else None
+    return contract.replace(barrier=barrier, barrier_type=barrier_type)
+
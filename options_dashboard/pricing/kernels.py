@@ -0,0 +1,316 @@
+"""
+Array kernels for Black-Scholes price/Greeks, implied vol and CRR lattices.
+
+Two interchangeable backends:
+  "numpy" - vectorised NumPy/SciPy, always available
+  "numba" - compiled, parallel over contracts; used when numba is installed
+
+Pick one with set_backend() or OPTIONS_DASHBOARD_BACKEND (default "auto":
+numba if importable, else numpy). numba is only imported the first time a
+kernel runs, and its kernels are cached on disk, so CLI startup doesn't pay
+for compilation.
+
+All functions broadcast their arguments and follow BlackScholesPricer's
+conventions: vega per 1.00 vol, rho per 1%, theta as value lost per day.
+"""
+import math
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from scipy.special import ndtr
+
+from options_dashboard.core import instrumentation as instr
+
+BACKENDS = ("auto", "numpy", "numba")
+
+_requested = os.environ.get("OPTIONS_DASHBOARD_BACKEND", "auto").lower()
+_impl = None
+
+
+def set_backend(name):
+    global _requested, _impl
+    name = name.lower()
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown backend {name!r}; choose from {BACKENDS}")
+    _requested = name
+    _impl = None
+
+
+def get_backend():
+    return _backend()[0]
+
+
+def _backend():
+    global _impl
+    if _impl is None:
+        if _requested in ("auto", "numba"):
+            try:
+                from options_dashboard.pricing import _numba_kernels
+                _impl = ("numba", _numba_kernels)
+            except ImportError:
+                if _requested == "numba":
+                    raise
+        if _impl is None:
+            _impl = ("numpy", None)
+    return _impl
+
+
+def process_pool(max_workers, initializer=None, initargs=()):
+    """
+    ProcessPoolExecutor that is safe to open after kernels have run. numba's
+    parallel thread pool doesn't survive fork(), so with the numba backend
+    workers are spawned instead of forked.
+    """
+    context = multiprocessing.get_context("spawn") if get_backend() == "numba" else None
+    return ProcessPoolExecutor(max_workers=max_workers, mp_context=context, initializer=initializer,
+                               initargs=initargs)
+
+
+def resolve_jobs(n_jobs):
+    """Worker count for an n_jobs argument: None -> 1, -1 -> all cores, -2 -> all but one, ..."""
+    if n_jobs is None:
+        return 1
+    if n_jobs < 0:
+        return max((os.cpu_count() or 1) + 1 + n_jobs, 1)
+    return max(int(n_jobs), 1)
+
+
+def parallel_map(fn, context, jobs, n_jobs=1, min_jobs=2):
+    """
+    [fn(context, *job) for job in jobs], across resolve_jobs(n_jobs) worker
+    processes when there are at least min_jobs jobs. `context` (a pricer,
+    a simulation spec, ...) is shipped to each worker once rather than with
+    every job; fn must be a module-level function so spawned workers can
+    import it.
+    """
+    jobs = list(jobs)
+    n_jobs = resolve_jobs(n_jobs)
+    if n_jobs <= 1 or len(jobs) < max(min_jobs, 2):
+        return [fn(context, *job) for job in jobs]
+    chunksize = max(1, math.ceil(len(jobs) / (4 * n_jobs)))
+    with process_pool(n_jobs, initializer=_init_worker, initargs=(fn, context)) as pool:
+        return list(pool.map(_run_worker, jobs, chunksize=chunksize))
+
+
+_worker = None
+
+
+def _init_worker(fn, context):
+    global _worker
+    _worker = (fn, context)
+
+
+def _run_worker(job):
+    fn, context = _worker
+    return fn(context, *job)
+
+
+def _prepare(*args):
+    # broadcast to a common shape and flatten to contiguous 1-D kernel inputs
+    arrays = [np.asarray(a) for a in args]
+    shape = np.broadcast_shapes(*[a.shape for a in arrays])
+    flat = []
+    for i, a in enumerate(arrays):
+        dtype = np.bool_ if i == len(arrays) - 1 else np.float64
+        if a.shape != shape:
+            a = np.broadcast_to(a, shape)
+        flat.append(np.ascontiguousarray(a, dtype=dtype).reshape(-1))
+    return shape, flat
+
+
+# --- public kernels ---
+def bs_price(S, K, T, r, q, sigma, is_call):
+    shape, args = _prepare(S, K, T, r, q, sigma, is_call)
+    name, nk = _backend()
+    instr.count("kernels.bs_price", args[0].size)
+    out = nk.bs_price(*args) if nk is not None else _bs_price_np(*args)
+    return out.reshape(shape)
+
+
+def bs_greeks(S, K, T, r, q, sigma, is_call):
+    """dict of price, delta, gamma, vega, theta, rho and vanna (per 1.00 vol) arrays."""
+    shape, args = _prepare(S, K, T, r, q, sigma, is_call)
+    name, nk = _backend()
+    instr.count("kernels.bs_greeks", args[0].size)
+    out = nk.bs_greeks(*args) if nk is not None else _bs_greeks_np(*args)
+    keys = ("price", "delta", "gamma", "vega", "theta", "rho", "vanna")
+    return {k: out[i].reshape(shape) for i, k in enumerate(keys)}
+
+
+def bs_gamma(S, K, T, r, q, sigma):
+    """Gamma alone, for callers that reprice many spots (same for calls and puts)."""
+    shape, args = _prepare(S, K, T, r, q, sigma, False)
+    name, nk = _backend()
+    instr.count("kernels.bs_gamma", args[0].size)
+    out = nk.bs_gamma(*args[:-1]) if nk is not None else _bs_gamma_np(*args[:-1])
+    return out.reshape(shape)
+
+
+def implied_vol(price, S, K, T, r, q, is_call, tol=1e-6, max_iter=100, sigma_min=1e-6, sigma_max=5.0):
+    """
+    Vectorised version of BlackScholesPricer.implied_vol: Corrado-Miller start,
+    Halley steps safeguarded by a bisection bracket. NaN where the price is
+    outside the no-arbitrage bounds or the solve fails.
+    """
+    shape, args = _prepare(price, S, K, T, r, q, is_call)
+    name, nk = _backend()
+    instr.count("kernels.implied_vol", args[0].size)
+    with instr.timer(f"kernels.implied_vol.{name}"):
+        if nk is not None:
+            out = nk.implied_vol(*args, tol, max_iter, sigma_min, sigma_max)
+        else:
+            out = _implied_vol_np(*args, tol, max_iter, sigma_min, sigma_max)
+    return out.reshape(shape)
+
+
+def binomial_price(S, K, T, r, q, sigma, is_call, american=False, steps=200):
+    """Cox-Ross-Rubinstein lattice price for each contract."""
+    shape, args = _prepare(S, K, T, r, q, sigma, is_call)
+    name, nk = _backend()
+    instr.count("kernels.binomial", args[0].size)
+    with instr.timer(f"kernels.binomial.{name}"):
+        if nk is not None:
+            out = nk.binomial_price(*args, bool(american), int(steps))
+        else:
+            out = _binomial_np(*args, bool(american), int(steps))
+    return out.reshape(shape)
+
+
+# --- numpy backend ---
+def _npdf(x):
+    return np.exp(-0.5 * x * x) / math.sqrt(2 * math.pi)
+
+
+def _d1_d2(S, K, T, r, q, sigma):
+    with np.errstate(divide="ignore", invalid="ignore"):
+        vol_t = sigma * np.sqrt(T)
+        d1 = (np.log(S / K) + (r - q + 0.5 * sigma**2) * T) / vol_t
+    return d1, d1 - vol_t
+
+
+def _bs_price_np(S, K, T, r, q, sigma, is_call):
+    d1, d2 = _d1_d2(S, K, T, r, q, sigma)
+    fS = S * np.exp(-q * T)
+    fK = K * np.exp(-r * T)
+    call = fS * ndtr(d1) - fK * ndtr(d2)
+    put = fK * ndtr(-d2) - fS * ndtr(-d1)
+    out = np.where(is_call, call, put)
+    # expired contracts are worth intrinsic
+    expired = T <= 0
+    if expired.any():
+        out = np.where(expired, np.where(is_call, np.maximum(S - K, 0.0), np.maximum(K - S, 0.0)), out)
+    return out
+
+
+def _bs_greeks_np(S, K, T, r, q, sigma, is_call):
+    d1, d2 = _d1_d2(S, K, T, r, q, sigma)
+    eq = np.exp(-q * T)
+    er = np.exp(-r * T)
+    sqrt_T = np.sqrt(T)
+    pdf = _npdf(d1)
+    Nd1, Nd2 = ndtr(d1), ndtr(d2)
+
+    price = _bs_price_np(S, K, T, r, q, sigma, is_call)
+    delta = np.where(is_call, eq * Nd1, eq * (Nd1 - 1.0))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        gamma = eq * pdf / (sigma * S * sqrt_T)
+        decay = -S * eq * pdf * sigma / (2 * sqrt_T)
+        vanna = -eq * pdf * d2 / sigma
+    vega = S * sqrt_T * eq * pdf
+    theta_call = decay - r * K * er * Nd2 + q * S * eq * Nd1
+    theta_put = decay + r * K * er * (1 - Nd2) - q * S * eq * (1 - Nd1)
+    theta = -np.where(is_call, theta_call, theta_put) / 365
+    rho = np.where(is_call, K * T * er * Nd2, -K * T * er * (1 - Nd2)) / 100
+    return np.stack([price, delta, gamma, vega, theta, rho, vanna])
+
+
+def _bs_gamma_np(S, K, T, r, q, sigma):
+    d1, _ = _d1_d2(S, K, T, r, q, sigma)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.exp(-q * T) * _npdf(d1) / (sigma * S * np.sqrt(T))
+
+
+def _implied_vol_np(price, S, K, T, r, q, is_call, tol, max_iter, sigma_min, sigma_max):
+    n = price.size
+    out = np.full(n, np.nan)
+
+    fS = S * np.exp(-q * T)
+    fK = K * np.exp(-r * T)
+    lower = np.where(is_call, np.maximum(fS - fK, 0.0), np.maximum(fK - fS, 0.0))
+    upper = np.where(is_call, fS, fK)
+    active = (T > 0) & (price > lower) & (price < upper)
+
+    # Corrado-Miller start (Brenner-Subrahmanyam where it degenerates)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        call = np.where(is_call, price, price + fS - fK)
+        x = call - 0.5 * (fS - fK)
+        disc = np.maximum(x * x - (fS - fK) ** 2 / math.pi, 0.0)
+        guess = np.sqrt(2 * math.pi / T) / (fS + fK) * (x + np.sqrt(disc))
+        bs = np.sqrt(2 * math.pi / T) * call / fS
+    guess = np.where(np.isfinite(guess) & (guess > 0), guess, bs)
+    sigma = np.clip(np.where(np.isfinite(guess) & (guess > 0), guess, 0.2), sigma_min, sigma_max)
+
+    lo = np.full(n, sigma_min)
+    hi = np.full(n, sigma_max)
+    for _ in range(max_iter):
+        idx = np.nonzero(active)[0]
+        if idx.size == 0:
+            break
+        s = sigma[idx]
+        Si, Ki, Ti, ri, qi, ci = S[idx], K[idx], T[idx], r[idx], q[idx], is_call[idx]
+        err = _bs_price_np(Si, Ki, Ti, ri, qi, s, ci) - price[idx]
+
+        done = np.abs(err) < tol
+        out[idx[done]] = s[done]
+        active[idx[done]] = False
+
+        lo[idx] = np.where(err < 0, s, lo[idx])
+        hi[idx] = np.where(err > 0, s, hi[idx])
+
+        d1, d2 = _d1_d2(Si, Ki, Ti, ri, qi, s)
+        vega = Si * np.sqrt(Ti) * np.exp(-qi * Ti) * _npdf(d1)
+        with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+            newton = err / vega
+            denom = 1.0 - 0.5 * newton * d1 * d2 / s
+            step = np.where(denom > 0.5, newton / denom, newton)
+            new = s - step
+        # step left the bracket (or vega vanished): bisect instead
+        bad = ~np.isfinite(new) | (new <= lo[idx]) | (new >= hi[idx])
+        new = np.where(bad, 0.5 * (lo[idx] + hi[idx]), new)
+        sigma[idx] = new
+
+        # bracket collapsed without hitting tol on price (flat vega): accept midpoint
+        tight = (hi[idx] - lo[idx]) < 1e-10
+        out[idx[tight]] = new[tight]
+        active[idx[tight]] = False
+
+    return out
+
+
+def _binomial_np(S, K, T, r, q, sigma, is_call, american, steps):
+    n = S.size
+    out = np.where(is_call, np.maximum(S - K, 0.0), np.maximum(K - S, 0.0))
+    live = np.nonzero(T > 0)[0]
+    if live.size == 0:
+        return out
+
+    S, K, T, r, q, sigma, is_call = (a[live, None] for a in (S, K, T, r, q, sigma, is_call))
+    dt = T / steps
+    u = np.exp(sigma * np.sqrt(dt))
+    d = 1.0 / u
+    p = (np.exp((r - q) * dt) - d) / (u - d)
+    disc = np.exp(-r * dt)
+    sign = np.where(is_call, 1.0, -1.0)
+
+    j = np.arange(steps + 1)[None, :]
+    values = np.maximum(sign * (S * u ** (2 * j - steps) - K), 0.0)
+    for i in range(steps - 1, -1, -1):
+        values = disc * (p * values[:, 1:i + 2] + (1 - p) * values[:, :i + 1])
+        if american:
+            spot = S * u ** (2 * j[:, :i + 1] - i)
+            values = np.maximum(values, sign * (spot - K))
+
+    out[live] = values[:, 0]
+    return out
@@ -0,0 +1,240 @@
+"""
+Correlated multi-asset Monte Carlo for basket, spread and best-of/worst-of options.
+
+Assets follow correlated GBMs. Paths are generated in fixed-size chunks
+(pseudo-random or scrambled Sobol, optionally through a Brownian bridge),
+priced and reduced to running sums before the next chunk, so memory is
+bounded by chunk_size x n_steps x n_assets whatever n_paths is. Chunks
+are independent and seeded from the engine seed, so results are the same
+serially or across n_jobs processes.
+"""
+import math
+
+import numpy as np
+import pandas as pd
+from scipy.special import ndtri
+from scipy.stats import qmc
+
+from options_dashboard.core import instrumentation as instr
+from options_dashboard.core.types import OptionType
+from options_dashboard.pricing import kernels
+
+
+# --- payoffs ---
+# each takes simulated prices (paths x steps x assets) and the initial spots
+class Basket:
+    """Option on sum(weights * S_T) (or its time average with averaging=True)."""
+
+    def __init__(self, weights, strike, option_type=OptionType.CALL, averaging=False):
+        self.weights = np.asarray(weights, dtype=float)
+        self.strike = float(strike)
+        self.option_type = option_type
+        self.averaging = averaging
+
+    def __call__(self, paths, spots):
+        level = (paths.mean(axis=1) if self.averaging else paths[:, -1, :]) @ self.weights
+        return _vanilla(level, self.strike, self.option_type)
+
+
+class Spread:
+    """Option on long_weight * S_long - short_weight * S_short."""
+
+    def __init__(self, strike=0.0, option_type=OptionType.CALL, long=0, short=1, long_weight=1.0, short_weight=1.0):
+        self.strike = float(strike)
+        self.option_type = option_type
+        self.long, self.short = long, short
+        self.long_weight, self.short_weight = long_weight, short_weight
+
+    def __call__(self, paths, spots):
+        ST = paths[:, -1, :]
+        level = self.long_weight * ST[:, self.long] - self.short_weight * ST[:, self.short]
+        return _vanilla(level, self.strike, self.option_type)
+
+
+class BestOf:
+    """Rainbow option on the best performer, max_i S_T,i / S_0,i; strike is a performance level."""
+
+    def __init__(self, strike=1.0, option_type=OptionType.CALL, notional=1.0):
+        self.strike = float(strike)
+        self.option_type = option_type
+        self.notional = notional
+
+    def _level(self, perf):
+        return perf.max(axis=1)
+
+    def __call__(self, paths, spots):
+        perf = paths[:, -1, :] / spots
+        return self.notional * _vanilla(self._level(perf), self.strike, self.option_type)
+
+
+class WorstOf(BestOf):
+    """Rainbow option on the worst performer, min_i S_T,i / S_0,i."""
+
+    def _level(self, perf):
+        return perf.min(axis=1)
+
+
+def _vanilla(level, strike, option_type):
+    if option_type is OptionType.CALL:
+        return np.maximum(level - strike, 0.0)
+    return np.maximum(strike - level, 0.0)
+
+
+# --- engine ---
+class MultiAssetMonteCarlo:
+    """
+    Prices multi-asset payoffs under correlated GBM.
+
+    sobol=True draws scrambled Sobol points; each chunk is then an
+    independent randomisation and the standard error comes from the spread
+    of chunk means (randomised QMC), and n_paths is rounded up to whole
+    power-of-two chunks. brownian_bridge=True builds paths coarse-to-fine
+    so the first Sobol dimensions drive the terminal values.
+    """
+
+    def __init__(self, n_paths=100_000, chunk_size=16_384, n_steps=1, sobol=False, brownian_bridge=False,
+                 n_jobs=1, seed=1234):
+        self.n_paths = int(n_paths)
+        self.chunk_size = int(chunk_size)
+        self.n_steps = int(n_steps)
+        self.sobol = sobol
+        self.brownian_bridge = brownian_bridge
+        self.n_jobs = n_jobs
+        self.seed = seed
+
+    def price(self, payoff, spots, vols, corr, T, rate, div_yields=0.0):
+        """
+        Discounted expected payoff. spots, vols and div_yields are per asset;
+        corr is the asset correlation matrix. Returns a dict with price,
+        stderr, n_paths and n_chunks.
+        """
+        spots = np.asarray(spots, dtype=float)
+        d = spots.size
+        spec = {
+            "payoff": payoff, "spots": spots, "T": float(T), "rate": float(rate), "n_steps": self.n_steps,
+            "vols": np.broadcast_to(np.asarray(vols, dtype=float), (d,)).copy(),
+            "divs": np.broadcast_to(np.asarray(div_yields, dtype=float), (d,)).copy(),
+            "chol": _cholesky(np.asarray(corr, dtype=float)),
+            "sobol": self.sobol, "bridge": _bridge_plan(self.n_steps) if self.brownian_bridge else None,
+        }
+
+        chunk = self.chunk_size
+        if self.sobol:
+            chunk = 1 << int(math.log2(max(chunk, 2)))          # Sobol balance needs powers of two
+        n_chunks = max(1, math.ceil(self.n_paths / chunk))
+        seeds = np.random.SeedSequence(self.seed).spawn(n_chunks)
+        jobs = [(s, chunk if self.sobol else min(chunk, self.n_paths - i * chunk)) for i, s in enumerate(seeds)]
+
+        with instr.timer("multiasset.price"):
+            results = kernels.parallel_map(_run_chunk, spec, jobs, self.n_jobs)
+        instr.count("multiasset.paths", sum(n for _, n in jobs))
+
+        total, total_sq, n = (sum(r[i] for r in results) for i in range(3))
+        disc = math.exp(-spec["rate"] * spec["T"])
+        mean = total / n
+        if self.sobol:
+            # randomised QMC: chunks are independent replicates
+            means = np.array([r[0] / r[2] for r in results])
+            stderr = float(means.std(ddof=1)) / math.sqrt(n_chunks) if n_chunks > 1 else float("nan")
+        else:
+            var = max(total_sq / n - mean * mean, 0.0) * n / max(n - 1, 1)
+            stderr = math.sqrt(var / n)
+        return {"price": disc * mean, "stderr": disc * stderr, "n_paths": int(n), "n_chunks": n_chunks}
+
+
+def estimate_inputs(histories, window=None, annualize=252):
+    """
+    Spots, annualised vols and the correlation matrix of daily log returns
+    from close histories (dict of ticker -> Series, aligned on common dates).
+    window: use only the last `window` returns.
+    """
+    closes = pd.DataFrame({k: pd.Series(v) for k, v in histories.items()}).dropna()
+    returns = np.log(closes).diff().dropna()
+    if window is not None:
+        returns = returns.iloc[-window:]
+    return {
+        "tickers": list(closes.columns),
+        "spots": closes.iloc[-1].to_numpy(dtype=float),
+        "vols": returns.std().to_numpy(dtype=float) * math.sqrt(annualize),
+        "corr": np.corrcoef(returns.to_numpy(dtype=float), rowvar=False),
+    }
+
+
+def inputs_from_tickers(tickers, window=None):
+    """estimate_inputs() on get_spot_and_history for each ticker (live spots)."""
+    from options_dashboard.data.data import get_spot_and_history
+
+    spots, histories = {}, {}
+    for t in tickers:
+        spots[t], histories[t] = get_spot_and_history(t)
+    inputs = estimate_inputs(histories, window=window)
+    inputs["spots"] = np.array([spots[t] if spots[t] is not None else s
+                                for t, s in zip(inputs["tickers"], inputs["spots"])], dtype=float)
+    return inputs
+
+
+def _cholesky(corr):
+    try:
+        return np.linalg.cholesky(corr)
+    except np.linalg.LinAlgError:
+        # estimated matrices can be slightly indefinite: clip eigenvalues and rescale to unit diagonal
+        w, v = np.linalg.eigh(corr)
+        fixed = (v * np.maximum(w, 1e-10)) @ v.T
+        scale = np.sqrt(np.diag(fixed))
+        return np.linalg.cholesky(fixed / np.outer(scale, scale))
+
+
+def _bridge_plan(n_steps):
+    # (target, left, right, left weight, right weight, sd factor) in the order the points
+    # are filled: terminal first, then successive midpoints; indices are grid points 0..n_steps
+    plan = [(n_steps, 0, None, 0.0, 0.0, 1.0)]
+    intervals = [(0, n_steps)]
+    while intervals:
+        nxt = []
+        for lo, hi in intervals:
+            if hi - lo < 2:
+                continue
+            mid = (lo + hi) // 2
+            wl, wr = (hi - mid) / (hi - lo), (mid - lo) / (hi - lo)
+            plan.append((mid, lo, hi, wl, wr, math.sqrt((mid - lo) * (hi - mid) / (hi - lo))))
+            nxt += [(lo, mid), (mid, hi)]
+        intervals = nxt
+    return plan
+
+
+def _normals(spec, seed, n):
+    dims = spec["n_steps"] * spec["spots"].size
+    if spec["sobol"]:
+        u = qmc.Sobol(dims, scramble=True, seed=np.random.default_rng(seed)).random(n)
+        z = ndtri(np.clip(u, 1e-12, 1 - 1e-12))
+    else:
+        z = np.random.default_rng(seed).standard_normal((n, dims))
+    # dimension order is step-major, so with a bridge the first columns set the terminal values
+    return z.reshape(n, spec["n_steps"], spec["spots"].size)
+
+
+def _brownian(z, T, plan):
+    # standard Brownian increments (n x steps x assets) from independent normals
+    n, steps, d = z.shape
+    dt = T / steps
+    if plan is None:
+        return z * math.sqrt(dt)
+    W = np.zeros((n, steps + 1, d))
+    for k, (target, left, right, wl, wr, sd) in enumerate(plan):
+        if right is None:
+            W[:, target] = math.sqrt(T) * z[:, k]
+        else:
+            W[:, target] = wl * W[:, left] + wr * W[:, right] + sd * math.sqrt(dt) * z[:, k]
+    return np.diff(W, axis=1)
+
+
+def _run_chunk(spec, seed, n):
+    z = _normals(spec, seed, n)
+    dW = _brownian(z, spec["T"], spec["bridge"]) @ spec["chol"].T        # correlate across assets
+    dt = spec["T"] / spec["n_steps"]
+    vols = spec["vols"]
+    drift = (spec["rate"] - spec["divs"] - 0.5 * vols * vols) * dt
+    paths = spec["spots"] * np.exp(np.cumsum(drift + vols * dW, axis=1))
+    payoff = spec["payoff"](paths, spec["spots"])
+    return float(payoff.sum()), float((payoff * payoff).sum()), n
+
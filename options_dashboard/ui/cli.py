@@ -3,8 +3,11 @@ import datetime as dt
 from options_dashboard.core.market import MarketData
 from options_dashboard.core.contract import Contract
 from options_dashboard.pricing.blackscholes import BlackScholesPricer
-from options_dashboard.data.data import get_spot_and_history, get_option_chain, get_rate, get_div_yield, get_mid_from_chain
+from options_dashboard.data.data import get_spot_and_history, get_chain, get_rate, get_div_yield, get_mid_from_chain
+from options_dashboard.data.curve import get_curve
 from options_dashboard.analytics.volanalytics import VolModels
+from options_dashboard.analytics.strategies import StrategySearch
+from options_dashboard.analytics.density import implied_distribution
 from options_dashboard.core.types import OptionType
 
 def run():
@@ -52,14 +55,37 @@ def run():
         else:
             raise ValueError("Invalid option type")
         print("Select Expiration")
-        print(get_option_chain(ticker)['expiry'].unique())
+        chain = get_chain(ticker)
+        print(chain.expiries)
         expiry = input("")
         expiry = dt.datetime.strptime(expiry, "%Y-%m-%d").date()
         print("Select Strike")
-        print(get_option_chain(ticker)['strike'].unique())
+        print(chain.expiry(expiry)['strike'].unique())
         strike = input("")
         return option_type, expiry, strike
 
+    # Function to run the strategy search and print the best candidates
+    def show_strategy_results(ticker, market):
+        print("STRATEGY ANALYSIS")
+        print("Rank by: 1. Expected Value  2. Probability of Profit  3. EV / Max Loss")
+        rank_by = {"1": "ev", "2": "pop", "3": "ev_to_risk"}.get(input("").strip(), "ev")
+        max_loss = input("Max loss per contract (blank for none): ").strip()
+        chain = get_chain(ticker)
+        expiries = [e for e in chain.expiries if (e - market.asof).days <= 180]
+        # EV and PoP under the market-implied distribution, so skew isn't scored as mispricing;
+        # fitted on the searched expiries only, so no others are downloaded
+        distribution = implied_distribution(ticker, market, expiries=expiries)
+        search = StrategySearch(chain.frame(expiries), market, distribution=distribution, max_dte=180)
+        results = search.search(rank_by=rank_by, max_loss=float(max_loss) / 100 if max_loss else None, top=15)
+        if results.empty:
+            print("No strategies passed the filters")
+            return
+        # search works per share; show dollar columns per 100-share contract like the prompt
+        table = results[["kind", "expiry", "legs", "cost", "ev", "pop", "max_loss", "delta", "theta"]].copy()
+        table[["cost", "ev", "max_loss", "theta"]] *= 100
+        print("Cost, EV, max loss and theta in $ per contract")
+        print(table.to_string())
+
     # Function to pull up the vol analysis menu
     def show_vol_analysis_menu():
         print("VOL ANALYSIS")
@@ -73,6 +99,7 @@ def run():
     # Loop to continue showing the main menu untill a valid selection is made
     main_menu = True
     market = None
+    contract_menu_selection = None
     while main_menu == True:
         if main_menu_selection == "1":
             ticker = input("Yahoo Finance Ticker:").strip().upper()
@@ -81,12 +108,19 @@ def run():
             rate = get_rate()
             div_yield = get_div_yield(ticker)
             vol = VolModels.rolling_realized(history)
-            market = MarketData(asof=asof, spot=spot, rate=rate, div_yield=div_yield, vol=vol)
+            market = MarketData(asof=asof, spot=spot, rate=rate, div_yield=div_yield, vol=vol, curve=get_curve())
             contract_menu_selection = show_contract_menu()
             main_menu = False
         elif main_menu_selection == "2":
-            print("Strategy Analysis Coming Soon")
-            main_menu_selection = show_main_menu()
+            ticker = input("Yahoo Finance Ticker:").strip().upper()
+            asof = dt.date.today()
+            spot, history = get_spot_and_history(ticker)
+            rate = get_rate()
+            div_yield = get_div_yield(ticker)
+            vol = VolModels.rolling_realized(history)
+            market = MarketData(asof=asof, spot=spot, rate=rate, div_yield=div_yield, vol=vol, curve=get_curve())
+            show_strategy_results(ticker, market)
+            main_menu = False
         else:
             print("Not an option, select from the menu")
             main_menu_selection = show_main_menu()
@@ -152,7 +186,7 @@ def run():
                 option_type, expiry, strike = show_contract_info_menu(ticker)
                 contract = Contract(strike=strike, expiry=expiry, option_type=option_type, exercise_style='European')
                 pricer = BlackScholesPricer()
-                chain = get_option_chain(ticker)
+                chain = get_chain(ticker)
                 market_price = get_mid_from_chain(chain, expiry, float(strike), option_type.value)
                 iv = pricer.implied_vol(contract, market, market_price)
                 rolling_vol = VolModels.rolling_realized(history)